@@ -0,0 +1,210 @@
+"""Minimal asyncio HTTP/1.1 server and client with keep-alive, for the local JSON services.
+
+Handlers are ``async def handler(method, path, query, body)`` and return
+``(status, document)``, where ``document`` is ``bytes``, a ``str`` (sent
+as plain text) or anything else ``json.dumps`` accepts.
+
+``HTTPConnection`` is the client side: one keep-alive connection that
+issues GETs in sequence, enough for polling LiveClientData endpoints
+without a thread per endpoint.
+"""
+import asyncio
+import json
+import ssl
+import threading
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+async def handle_connection(handler, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            keep_alive = True
+            content_length = 0
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                if name == "connection" and "close" in value.lower():
+                    keep_alive = False
+                elif name == "content-length":
+                    content_length = int(value)
+            body = await reader.readexactly(content_length) if content_length else b""
+
+            parts = request_line.decode("latin-1").split()
+            method = parts[0] if parts else "GET"
+            url = urlsplit(parts[1] if len(parts) > 1 else "/")
+            status, document = await handler(method, url.path, parse_qs(url.query), body)
+            content_type = "application/json"
+            if isinstance(document, str):
+                payload = document.encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif isinstance(document, bytes):
+                payload = document
+            else:
+                payload = json.dumps(document).encode()
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_http(handler, host, port, ssl_context=None, ready=None):
+    """Serve ``handler`` until cancelled; ``ready(server)`` is called once bound."""
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(handler, r, w), host, port, ssl=ssl_context
+    )
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def run_in_thread(start, host="127.0.0.1", name="http-server"):
+    """Run ``start(ready)`` on a private event loop in a daemon thread.
+
+    ``start`` returns the coroutine that serves, e.g.
+    ``lambda ready: serve_http(handler, host, 0, ready=ready)``.
+    Returns ``(base_url, stop)``.
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    holder = {}
+
+    def ready(server):
+        holder["server"] = server
+        started.set()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        holder["task"] = loop.create_task(start(ready))
+        try:
+            loop.run_until_complete(holder["task"])
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            holder["error"] = e
+            started.set()
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    started.wait()
+    if "error" in holder:
+        raise holder["error"]
+    bound_port = holder["server"].sockets[0].getsockname()[1]
+
+    def stop():
+        loop.call_soon_threadsafe(holder["task"].cancel)
+        thread.join(5)
+
+    return f"http://{host}:{bound_port}", stop
+
+
+def insecure_ssl_context():
+    """TLS without certificate checks, for the live client's self-signed localhost certificate."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class HTTPConnection:
+    """One keep-alive HTTP/1.1 connection to ``base_url``; reconnects on demand.
+
+    Requests on one connection are sequential. Any error closes the
+    connection, so the next request starts from a fresh one.
+    """
+
+    def __init__(self, base_url, ssl_context=None):
+        url = urlsplit(base_url)
+        self.base_url = base_url.rstrip("/")
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl = (ssl_context or insecure_ssl_context()) if url.scheme == "https" else None
+        self._reader = None
+        self._writer = None
+
+    async def get(self, path, params=None):
+        """GET ``path``; return (status, body bytes)."""
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        try:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+            self._writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Connection: keep-alive\r\n\r\n".encode()
+            )
+            await self._writer.drain()
+            return await self._read_response()
+        except BaseException:
+            self.close()
+            raise
+
+    async def get_json(self, path, params=None):
+        """GET ``path``; return the decoded JSON, or None for a non-200 status."""
+        status, body = await self.get(path, params)
+        return json.loads(body) if status == 200 else None
+
+    async def _read_response(self):
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+        content_length = None
+        chunked = False
+        keep_alive = True
+        while True:
+            header = await self._reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                content_length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value:
+                chunked = True
+            elif name == "connection" and "close" in value:
+                keep_alive = False
+
+        if chunked:
+            body = bytearray()
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                body += await self._reader.readexactly(size)
+                await self._reader.readline()
+            body = bytes(body)
+        elif content_length is not None:
+            body = await self._reader.readexactly(content_length)
+        else:
+            body = await self._reader.read()
+            keep_alive = False
+        if not keep_alive:
+            self.close()
+        return status, body
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
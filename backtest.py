@@ -0,0 +1,209 @@
+"""Offline replay and backtest of recorded games.
+
+Recorded payloads go through exactly the live path:
+``game_from_live_data`` -> ``Predictor.predict_games``, with one
+``EventReducer`` per game and one ``predict_proba`` call per game.
+Games are scored on a process pool.
+
+A game's winner comes from its ``GameEnd`` event (``Result`` is from the
+active player's side) or from a ``--labels`` JSON file mapping game id to
+100/200; unlabelled games are scored but left out of the metrics.
+
+    python backtest.py "recordings/*.jsonl.gz" --workers 8 --output report.json
+"""
+import argparse
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from live_data import EventReducer, game_from_live_data, team_of
+from recorder import has_full_events, iter_recording
+
+CALIBRATION_BINS = 10
+
+_predictor = None
+
+
+def _init_worker():
+    global _predictor
+    from predictor import Predictor
+    _predictor = Predictor()
+
+
+def iter_games(paths):
+    """Group consecutive records with the same game id into (game_id, payloads).
+
+    A recorder gap marker becomes a ``None`` payload.
+    """
+    game_id, payloads = None, []
+    for record in iter_recording(paths):
+        if record["game_id"] != game_id and payloads:
+            yield game_id, payloads
+            payloads = []
+        game_id = record["game_id"]
+        payloads.append(None if record.get("gap") else record["data"])
+    if payloads:
+        yield game_id, payloads
+
+
+def game_result(live_data, active_team):
+    """Winning team from a GameEnd event in this payload, or None."""
+    for e in live_data.get("events", {}).get("Events", []):
+        if e.get("EventName") == "GameEnd" and active_team is not None:
+            if e.get("Result") == "Win":
+                return active_team
+            if e.get("Result") == "Lose":
+                return 300 - active_team
+    return None
+
+
+def active_team_of(live_data):
+    """Team of the active player; the name may be a summoner name or a Riot ID."""
+    name = (live_data.get("activePlayer") or {}).get("summonerName")
+    if not name:
+        return None
+    for p in live_data.get("allPlayers", []):
+        if name in (p.get("summonerName"), p.get("riotId"), p.get("riotIdGameName")):
+            return team_of(p)
+    return None
+
+
+def replay_game(payloads, platform_id="NA1", rank="Gold"):
+    """Replay one game's payloads; return (GameStates, winner or None).
+
+    No states are produced until a payload carries the full event list:
+    a recording may start mid-game, and after a gap (``None`` payload)
+    events were lost.
+    """
+    reducer = EventReducer()
+    games = []
+    active_team = None
+    winner = None
+    resyncing = True
+    for live_data in payloads:
+        if live_data is None:
+            resyncing = True
+            continue
+        active_team = active_team_of(live_data) or active_team
+        winner = game_result(live_data, active_team) or winner
+        if resyncing and not has_full_events(live_data):
+            continue
+        resyncing = False
+
+        games.append(game_from_live_data(live_data, reducer, platform_id, rank))
+    return games, winner
+
+
+def score_game(game_id, payloads, platform_id="NA1", rank="Gold", predictor=None):
+    """Replay one game; return (game_id, game times, P(team 100), winner or None)."""
+    predictor = predictor or _predictor
+    games, winner = replay_game(payloads, platform_id, rank)
+    _, proba = predictor.predict_games(games)
+    times = np.array([game.game_time for game in games], dtype=np.float64)
+    return game_id, times, proba[:, 0].copy(), winner
+
+
+def run_backtest(paths, labels=None, workers=None, platform_id="NA1", rank="Gold"):
+    """Score every recorded game on a process pool; return a list of game results."""
+    labels = labels or {}
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = set()
+        for game_id, payloads in iter_games(paths):
+            # Keep only a bounded number of games in flight
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(f.result() for f in done)
+            pending.add(pool.submit(score_game, game_id, payloads, platform_id, rank))
+        results.extend(f.result() for f in wait(pending)[0])
+
+    return [
+        (game_id, times, p100, labels.get(game_id, winner))
+        for game_id, times, p100, winner in results
+    ]
+
+
+def summarize(results):
+    """Per-minute accuracy, calibration and the accuracy-from-minute-N curve."""
+    labelled = [(times, p100, winner) for _, times, p100, winner in results if winner in (100, 200)]
+    report = {
+        "games": len(results),
+        "labelled_games": len(labelled),
+        "snapshots": int(sum(len(times) for _, times, _, _ in results)),
+    }
+    if not labelled:
+        return report
+
+    minutes = np.concatenate([(times // 60).astype(np.int64) for times, _, _ in labelled])
+    p100 = np.concatenate([p for _, p, _ in labelled])
+    y100 = np.concatenate([np.full(len(times), winner == 100, dtype=np.float64) for times, _, winner in labelled])
+    correct = (p100 >= 0.5) == (y100 == 1)
+    eps = 1e-15
+    log_loss = -(y100 * np.log(np.clip(p100, eps, 1)) + (1 - y100) * np.log(np.clip(1 - p100, eps, 1)))
+    brier = (p100 - y100) ** 2
+
+    report.update({
+        "accuracy": float(correct.mean()),
+        "brier": float(brier.mean()),
+        "log_loss": float(log_loss.mean()),
+    })
+
+    per_minute = []
+    from_minute = []
+    for m in range(int(minutes.max()) + 1):
+        at = minutes == m
+        if at.any():
+            per_minute.append({
+                "minute": m,
+                "n": int(at.sum()),
+                "accuracy": float(correct[at].mean()),
+                "brier": float(brier[at].mean()),
+            })
+        after = minutes >= m
+        from_minute.append({"minute": m, "n": int(after.sum()), "accuracy": float(correct[after].mean())})
+    report["per_minute"] = per_minute
+    report["accuracy_from_minute"] = from_minute
+
+    bins = np.minimum((p100 * CALIBRATION_BINS).astype(np.int64), CALIBRATION_BINS - 1)
+    report["calibration"] = [
+        {
+            "bin": f"{b / CALIBRATION_BINS:.1f}-{(b + 1) / CALIBRATION_BINS:.1f}",
+            "n": int((bins == b).sum()),
+            "mean_predicted": float(p100[bins == b].mean()),
+            "observed": float(y100[bins == b].mean()),
+        }
+        for b in range(CALIBRATION_BINS) if (bins == b).any()
+    ]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded games through the predictor and report accuracy.")
+    parser.add_argument("paths", nargs="+", help="Recording files or glob patterns (.jsonl.gz or .jsonl)")
+    parser.add_argument("--labels", help="JSON file mapping game id to the winning team (100 or 200)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--platform", default="NA1", help="platform_id used for every game")
+    parser.add_argument("--rank", default="Gold", help="rank used for every game")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    labels = None
+    if args.labels:
+        with open(args.labels) as f:
+            labels = {k: int(v) for k, v in json.load(f).items()}
+
+    results = run_backtest(args.paths, labels, args.workers, args.platform, args.rank)
+    report = summarize(results)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""Reproducible micro-benchmarks of the prediction and live-ingest hot paths.
+
+Runs on its own: no League client, network or browser. Live payloads and
+snapshots come from the seeded generators in ``synthetic``, so two runs on
+the same machine measure the same work.
+
+Benchmarks (each at several sizes):
+
+* ``decode`` -- ``json.loads`` of an ``allgamedata`` payload with N events;
+* ``reduce`` -- ``fill_inputs_from_live_data`` folding N events from scratch;
+* ``class_features`` -- ``get_class_subclass_features`` over N lineups;
+* ``features_pandas`` -- the original ``get_dummies`` + ``reindex`` feature
+  build for N snapshots, kept here as a reference point;
+* ``features_encoder`` / ``features_game_state`` -- the compiled encoders
+  for N snapshots / ``GameState`` objects;
+* ``predict_proba_numpy`` / ``predict_proba_sklearn`` -- inference on
+  batches of N rows with the NumPy export and the joblib model;
+* ``poll_full`` / ``poll_split`` -- scoring N states of one game (as
+  successive polls) by full encoding, or by ``Predictor.predict_games``
+  with its cached per-game static logit term.
+
+Each result holds the median, minimum and p95 time per call, the time per
+item and the peak traced memory of one call. Results are written as JSON.
+With ``--compare`` a previous file is the baseline, and the exit status is
+1 if any benchmark got slower than ``--threshold`` times the baseline
+median (or used more than ``--memory-threshold`` times its peak memory).
+
+    python benchmark.py --output bench.json
+    python benchmark.py --quick --compare bench.json --threshold 1.3
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from synthetic import synthetic_payload, synthetic_snapshots
+
+EVENT_COUNTS = [10, 100, 1000, 5000]
+ROW_COUNTS = [1, 100, 10000]
+BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+QUICK_SIZES = {"events": [10, 1000], "rows": [1, 100], "batch": [1, 1000]}
+
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes, kind):
+    """Register ``setup(size) -> zero-argument callable`` under ``name``."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, sizes, kind)
+        return setup
+    return register
+
+
+# === Reference feature build ===
+
+def pandas_feature_build(snapshots, feature_columns):
+    """The app's original feature build: class counts, ``get_dummies``, ``reindex``.
+
+    Categories are normalized like ``FeatureEncoder`` does, so both builds
+    give the same matrix.
+    """
+    import pandas as pd
+
+    from champions import get_class_subclass_features
+    from feature_encoder import normalize_category
+
+    rows = []
+    for snapshot in snapshots:
+        row = {k: v for k, v in snapshot.items() if not k.startswith("champion_")}
+        row["platform_id"] = normalize_category(row["platform_id"])
+        row["rank"] = normalize_category(row["rank"])
+        row.update(get_class_subclass_features([snapshot[f"champion_p{i+1}"] for i in range(10)]))
+        rows.append(row)
+    df = pd.get_dummies(pd.DataFrame(rows), columns=["platform_id", "rank"])
+    return df.reindex(columns=feature_columns, fill_value=0)
+
+
+# === Benchmarks ===
+
+@benchmark("decode", EVENT_COUNTS, "events")
+def bench_decode(n):
+    document = json.dumps(synthetic_payload(n))
+    return lambda: json.loads(document)
+
+
+@benchmark("reduce", EVENT_COUNTS, "events")
+def bench_reduce(n):
+    from live_data import EventReducer, fill_inputs_from_live_data
+
+    payload = synthetic_payload(n)
+    return lambda: fill_inputs_from_live_data(payload, {}, EventReducer())
+
+
+@benchmark("class_features", ROW_COUNTS, "rows")
+def bench_class_features(n):
+    from champions import get_class_subclass_features
+
+    lineups = [[s[f"champion_p{i+1}"] for i in range(10)] for s in synthetic_snapshots(n)]
+    return lambda: [get_class_subclass_features(lineup) for lineup in lineups]
+
+
+@benchmark("features_pandas", ROW_COUNTS, "rows")
+def bench_features_pandas(n):
+    from feature_encoder import load_feature_columns
+
+    snapshots = synthetic_snapshots(n)
+    feature_columns = load_feature_columns()
+    return lambda: pandas_feature_build(snapshots, feature_columns)
+
+
+@benchmark("features_encoder", ROW_COUNTS, "rows")
+def bench_features_encoder(n):
+    from feature_encoder import get_encoder
+
+    snapshots = synthetic_snapshots(n)
+    encoder = get_encoder()
+    return lambda: encoder.encode_batch(snapshots)
+
+
+@benchmark("features_game_state", ROW_COUNTS, "rows")
+def bench_features_game_state(n):
+    from feature_encoder import get_encoder
+    from game_state import GameState, GameStateLayout
+
+    games = [GameState.from_snapshot(s) for s in synthetic_snapshots(n)]
+    layout = GameStateLayout(get_encoder())
+    return lambda: layout.encode(games)
+
+
+def batch_matrix(n, seed=0):
+    """An (n, n_features) matrix tiled from encoded synthetic snapshots."""
+    from feature_encoder import get_encoder
+
+    X, _ = get_encoder().encode_batch(synthetic_snapshots(min(n, 1000), seed))
+    return np.ascontiguousarray(np.resize(X, (n, X.shape[1])))
+
+
+@benchmark("predict_proba_numpy", BATCH_SIZES, "batch")
+def bench_predict_proba_numpy(n):
+    from numpy_model import NUMPY_MODEL_PATH, NumpyModel
+
+    model = NumpyModel.load(NUMPY_MODEL_PATH)
+    X = batch_matrix(n)
+    return lambda: model.predict_proba(X)
+
+
+@benchmark("predict_proba_sklearn", BATCH_SIZES, "batch")
+def bench_predict_proba_sklearn(n):
+    import joblib
+    import pandas as pd
+
+    from feature_encoder import load_feature_columns
+    from numpy_model import SOURCE_MODEL_PATH
+
+    model = joblib.load(SOURCE_MODEL_PATH)
+    # The model was fitted on a DataFrame, as the app originally passed it
+    X = pd.DataFrame(batch_matrix(n), columns=load_feature_columns())
+    return lambda: model.predict_proba(X)
+
+
+def poll_states(n):
+    """``n`` states of one game at successive times."""
+    from game_state import GameState
+
+    game = GameState.from_snapshot(synthetic_snapshots(1)[0])
+    games = []
+    for k in range(n):
+        game = game.copy()
+        game.game_time += 2
+        games.append(game)
+    return games
+
+
+@benchmark("poll_full", ROW_COUNTS, "rows")
+def bench_poll_full(n):
+    from predictor import Predictor
+
+    predictor = Predictor()
+    games = poll_states(n)
+    return lambda: predictor.predict_matrix(predictor.encode_games(games)[0])
+
+
+@benchmark("poll_split", ROW_COUNTS, "rows")
+def bench_poll_split(n):
+    from predictor import Predictor
+
+    predictor = Predictor()
+    games = poll_states(n)
+    return lambda: predictor.predict_games(games)
+
+
+# === Measurement ===
+
+def measure(fn, repeat=7, min_time=0.05):
+    """Time ``fn``: calls per repeat are calibrated to take ``min_time``; returns seconds per call."""
+    fn()  # warm-up: imports, caches, buffers
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - started) / number)
+    return np.array(timings), number
+
+
+def peak_memory(fn):
+    """Peak traced allocation (bytes) of one call of ``fn``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(setup, size, repeat=7, min_time=0.05):
+    fn = setup(size)
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        timings, number = measure(fn, repeat, min_time)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    median = float(np.median(timings))
+    return {
+        "size": size,
+        "calls_per_repeat": number,
+        "repeat": len(timings),
+        "median_s": median,
+        "min_s": float(timings.min()),
+        "p95_s": float(np.percentile(timings, 95)),
+        "per_item_us": median / size * 1e6,
+        "peak_bytes": peak_memory(fn),
+    }
+
+
+def environment():
+    """What a result file was measured on."""
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_all(names=None, quick=False, repeat=7, min_time=0.05, log=None):
+    """Run the selected benchmarks; return the result document."""
+    log = log or (lambda message: None)
+    results = {}
+    for name, (setup, sizes, kind) in BENCHMARKS.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        for size in (QUICK_SIZES[kind] if quick else sizes):
+            key = f"{name}[{size}]"
+            results[key] = dict(benchmark=name, **run_benchmark(setup, size, repeat, min_time))
+            log(format_result(key, results[key]))
+    return {
+        "environment": environment(),
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+        "results": results,
+    }
+
+
+# === Reporting and regression checks ===
+
+def format_result(key, result):
+    return (f"{key:<32} median {result['median_s'] * 1e3:10.3f} ms   min {result['min_s'] * 1e3:10.3f} ms   "
+            f"{result['per_item_us']:10.2f} us/item   peak {result['peak_bytes'] / 1024:10.1f} KiB")
+
+
+def compare(current, baseline, threshold=1.25, memory_threshold=None):
+    """Benchmarks that regressed against ``baseline``: list of (key, metric, ratio).
+
+    Only benchmarks present in both documents are compared.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        if ratio > threshold:
+            regressions.append((key, "median_s", ratio))
+        if memory_threshold is not None and base["peak_bytes"]:
+            ratio = result["peak_bytes"] / base["peak_bytes"]
+            if ratio > memory_threshold:
+                regressions.append((key, "peak_bytes", ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the prediction and live-ingest hot paths.")
+    parser.add_argument("--output", help="Write results as JSON here")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Fail if a median time exceeds this multiple of the baseline")
+    parser.add_argument("--memory-threshold", type=float, default=None,
+                        help="Fail if peak memory exceeds this multiple of the baseline")
+    parser.add_argument("--only", nargs="+", help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--quick", action="store_true", help="Fewer, smaller sizes")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Seconds per timing repeat")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (_, sizes, kind) in BENCHMARKS.items():
+            print(f"{name:<24} {kind}: {sizes}")
+        return 0
+
+    document = run_all(args.only, args.quick, args.repeat, args.min_time, log=print)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(document, baseline, args.threshold, args.memory_threshold)
+        for key, metric, ratio in regressions:
+            print(f"REGRESSION {key}: {metric} {ratio:.2f}x baseline", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
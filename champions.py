@@ -0,0 +1,53 @@
+"""Champion class/subclass table shared by the Streamlit app and the headless predictor."""
+import csv
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHAMPION_CLASSES_PATH = os.path.join(BASE_DIR, "champion_classes.csv")
+
+roles = ["Top", "Jungle", "Mid", "ADC", "Support"]
+
+# Load champion class CSV once at import (csv rather than pandas keeps headless imports light)
+with open(CHAMPION_CLASSES_PATH, newline="", encoding="utf-8") as f:
+    champion_rows = [
+        {"name": row["name"], "class": row["class"], "subclass": row["subclass"] or row["class"]}
+        for row in csv.DictReader(f)
+    ]
+champion_class_map = {row["name"]: {"class": row["class"], "subclass": row["subclass"]} for row in champion_rows}
+all_classes = list(dict.fromkeys(row["class"] for row in champion_rows))
+all_subclasses = list(dict.fromkeys(row["subclass"] for row in champion_rows))
+champion_list = [row["name"] for row in champion_rows]
+
+
+UNKNOWN_CLASS = "None"
+
+
+def champion_classes(champ):
+    """(class, subclass) of a champion; unknown champions are class "None"."""
+    info = champion_class_map.get(champ)
+    if info is None:
+        return UNKNOWN_CLASS, UNKNOWN_CLASS
+    return info["class"], info["subclass"]
+
+
+def get_class_subclass_features(champs):
+    """Class/subclass counts per team for ten champions (team 100 first).
+
+    Missing champions (None) are not counted.
+    """
+    classes = all_classes + [UNKNOWN_CLASS]
+    subclasses = all_subclasses + [UNKNOWN_CLASS]
+    features = {f: 0 for f in (
+        [f"class_100_{c}" for c in classes] +
+        [f"class_200_{c}" for c in classes] +
+        [f"subclass_100_{s}" for s in subclasses] +
+        [f"subclass_200_{s}" for s in subclasses]
+    )}
+    for i, champ in enumerate(champs):
+        if champ is None:
+            continue
+        prefix = "100" if i < 5 else "200"
+        cls, subcls = champion_classes(champ)
+        features[f"class_{prefix}_{cls}"] += 1
+        features[f"subclass_{prefix}_{subcls}"] += 1
+    return features
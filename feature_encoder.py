@@ -0,0 +1,209 @@
+"""Compiled feature encoder for the win predictor.
+
+The encoder is built once per process from ``feature_columns.pkl``. Every
+logical input (per-player stats, objectives, ``platform_id``, ``rank`` and
+the class/subclass counts) is resolved to a fixed column index up front, so
+encoding a snapshot is a handful of array writes instead of
+``pd.get_dummies`` plus a wide ``reindex``. Inputs that map to no column are
+reported instead of being silently zero-filled.
+"""
+import functools
+import os
+import pickle
+import threading
+
+import numpy as np
+
+from champions import champion_classes, champion_list
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEATURE_COLUMNS_PATH = os.path.join(BASE_DIR, "feature_columns.pkl")
+
+N_PLAYERS = 10
+PLAYER_STATS = ["kills", "deaths", "assists", "total_minions_killed", "level"]
+CATEGORICAL_FIELDS = ["platform_id", "rank"]
+COMPOSITION_PREFIXES = ("class_", "subclass_")
+CHAMPION_FIELDS = [f"champion_p{i+1}" for i in range(N_PLAYERS)]
+TEAMS = (100, 200)
+# Team slot (0 = team 100, 1 = team 200) of each of the ten players
+PLAYER_TEAM = np.array([0] * 5 + [1] * 5, dtype=np.intp)
+NO_CHAMPION = -1
+
+
+def normalize_category(value):
+    """Canonical spelling of a categorical value ("Gold" -> "GOLD")."""
+    return str(value).strip().upper()
+
+
+def champions_of(snapshot):
+    """Return the ten champion names of a snapshot in p1..p10 order."""
+    return [snapshot.get(field) for field in CHAMPION_FIELDS]
+
+
+class CompositionTable:
+    """Champion -> class/subclass column indices per team, compiled once.
+
+    Champion ids index ``champion_list``; one extra id stands for unknown
+    champions, which count as class/subclass "None" like the training data.
+    Composition features for a batch of lineups are then a scatter-add.
+    """
+
+    def __init__(self, column_index):
+        self.champion_ids = {name: i for i, name in enumerate(champion_list)}
+        self.unknown_id = len(champion_list)
+        names = champion_list + [None]
+
+        # columns[kind, team, champion id] -> column, -1 when the schema has none
+        self.columns = np.full((2, len(TEAMS), len(names)), -1, dtype=np.intp)
+        self.column_names = np.empty(self.columns.shape, dtype=object)
+        for t, team in enumerate(TEAMS):
+            for champion_id, name in enumerate(names):
+                cls, subcls = champion_classes(name)
+                for kind, (prefix, value) in enumerate((("class", cls), ("subclass", subcls))):
+                    column = f"{prefix}_{team}_{value}"
+                    self.column_names[kind, t, champion_id] = column
+                    self.columns[kind, t, champion_id] = column_index.get(column, -1)
+
+    def champion_id(self, name):
+        if name is None:
+            return NO_CHAMPION
+        return self.champion_ids.get(name, self.unknown_id)
+
+    def scatter(self, X, champion_ids):
+        """Add class/subclass counts for (n, 10) champion ids into X.
+
+        Returns the names of count columns missing from the schema.
+        """
+        champion_ids = np.asarray(champion_ids, dtype=np.intp)
+        present = champion_ids != NO_CHAMPION
+        rows = np.broadcast_to(np.arange(len(champion_ids))[:, None], champion_ids.shape)
+        teams = np.broadcast_to(PLAYER_TEAM, champion_ids.shape)
+        unmapped = set()
+        for kind in range(2):
+            cols = self.columns[kind, teams, champion_ids]
+            valid = present & (cols >= 0)
+            np.add.at(X, (rows[valid], cols[valid]), 1)
+            missing = present & (cols < 0)
+            if missing.any():
+                unmapped.update(self.column_names[kind, teams[missing], champion_ids[missing]])
+        return unmapped
+
+
+class FeatureEncoder:
+    """Maps snapshot fields to fixed column indices of the model schema."""
+
+    def __init__(self, feature_columns):
+        self.feature_columns = list(feature_columns)
+        self.column_index = {name: i for i, name in enumerate(self.feature_columns)}
+
+        categorical_prefixes = tuple(f"{field}_" for field in CATEGORICAL_FIELDS)
+        numeric = [
+            (name, i) for i, name in enumerate(self.feature_columns)
+            if not name.startswith(categorical_prefixes + COMPOSITION_PREFIXES)
+        ]
+        self.numeric_fields = [name for name, _ in numeric]
+        self.numeric_index = np.array([i for _, i in numeric], dtype=np.intp)
+
+        # One-hot columns keyed by the normalized category value
+        self.categorical_index = {field: {} for field in CATEGORICAL_FIELDS}
+        for i, name in enumerate(self.feature_columns):
+            for field in CATEGORICAL_FIELDS:
+                if name.startswith(f"{field}_"):
+                    value = name[len(field) + 1:]
+                    self.categorical_index[field][normalize_category(value)] = i
+
+        self.composition = CompositionTable(self.column_index)
+        self.known_fields = set(self.numeric_fields) | set(CHAMPION_FIELDS) | set(CATEGORICAL_FIELDS)
+        self._local = threading.local()
+
+    @property
+    def n_features(self):
+        return len(self.feature_columns)
+
+    def encode_fields(self, snapshot, row, champion_ids):
+        """Write the scalar fields of one snapshot into a zeroed row.
+
+        Champion ids go to ``champion_ids``; composition counts are added
+        for the whole batch by ``CompositionTable.scatter``. Returns the
+        unmapped input names.
+        """
+        unmapped = [name for name in snapshot if name not in self.known_fields]
+
+        row[self.numeric_index] = [snapshot.get(name, 0) for name in self.numeric_fields]
+
+        for field in CATEGORICAL_FIELDS:
+            value = snapshot.get(field)
+            if value is None:
+                continue
+            col = self.categorical_index[field].get(normalize_category(value))
+            if col is None:
+                unmapped.append(f"{field}_{value}")
+            else:
+                row[col] = 1
+
+        champion_id = self.composition.champion_id
+        for i, field in enumerate(CHAMPION_FIELDS):
+            name = snapshot.get(field)
+            champion_ids[i] = champion_id(name)
+            if champion_ids[i] == self.composition.unknown_id:
+                unmapped.append(f"{field}_{name}")
+        return unmapped
+
+    def check_snapshot(self, snapshot):
+        """Raise ValueError naming the first field whose value cannot be encoded."""
+        for name in self.numeric_fields:
+            if name not in snapshot:
+                continue
+            value = snapshot[name]
+            try:
+                if value is None or isinstance(value, str):
+                    raise TypeError
+                float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{name}: expected a number, got {value!r}") from None
+        for name in CATEGORICAL_FIELDS + CHAMPION_FIELDS:
+            value = snapshot.get(name)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{name}: expected a string, got {value!r}")
+
+    def buffer(self, n):
+        """Zeroed (n, n_features) view of this thread's reusable buffer."""
+        buf = getattr(self._local, "buffer", None)
+        if buf is None or buf.shape[0] < n:
+            buf = np.zeros((max(n, 1), self.n_features), dtype=np.float64)
+            self._local.buffer = buf
+        out = buf[:n]
+        out.fill(0)
+        return out
+
+    def encode_batch(self, snapshots, out=None):
+        """Encode snapshots into a matrix; return (X, sorted unmapped names).
+
+        Without ``out`` the matrix is a view of this thread's reusable buffer
+        and is only valid until the next call on the same thread.
+        """
+        n = len(snapshots)
+        if out is None:
+            out = self.buffer(n)
+        else:
+            out = out[:n]
+            out.fill(0)
+
+        champion_ids = np.empty((n, N_PLAYERS), dtype=np.intp)
+        unmapped = set()
+        for r, snapshot in enumerate(snapshots):
+            unmapped.update(self.encode_fields(snapshot, out[r], champion_ids[r]))
+        unmapped.update(self.composition.scatter(out, champion_ids))
+        return out, sorted(unmapped)
+
+
+def load_feature_columns(path=FEATURE_COLUMNS_PATH):
+    """Read the pickled column list; plain pickle, so joblib is not imported."""
+    with open(path, "rb") as f:
+        return list(pickle.load(f))
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(feature_columns_path=FEATURE_COLUMNS_PATH):
+    """Process-wide encoder, loaded from the pickled schema once."""
+    return FeatureEncoder(load_feature_columns(feature_columns_path))
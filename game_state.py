@@ -0,0 +1,310 @@
+"""Typed, array-backed game state shared by the live, manual and headless paths.
+
+A ``GameState`` holds one game moment in a few small NumPy arrays instead of
+~80 string-keyed fields: per-player stats as a (5, 10) float array in
+``PLAYER_STATS`` order, objective counts and flags as (2, k) arrays per team,
+each team's dragons by type, plus the lineup, game time, platform and rank. ``GameStateLayout`` compiles
+those arrays to model columns once, so encoding a batch of states is a few
+fancy-indexed assignments.
+
+"Yes"/"No" strings and widget keys such as ``k_t1_Top`` only exist at the
+Streamlit boundary (``from_widget_state`` / ``widget_state``); flat snapshot
+dicts (see ``predictor``) convert with ``from_snapshot`` / ``to_snapshot``.
+"""
+import numpy as np
+
+from champions import champion_list, roles
+from feature_encoder import N_PLAYERS, PLAYER_STATS, TEAMS, normalize_category
+
+DRAGON_TYPES = ["Infernal", "Mountain", "Ocean", "Cloud", "Hextech", "Chemtech", "Elder"]
+DRAGON_SLOTS = 5
+# Per-type count fields are ``{prefix}_dragon_{team}``, e.g. ``fire_dragon_100``
+DRAGON_FIELD_PREFIXES = {
+    "Infernal": "fire", "Mountain": "earth", "Ocean": "water", "Cloud": "air",
+    "Hextech": "hextech", "Chemtech": "chemtech", "Elder": "elder",
+}
+COUNT_OBJECTIVES = ["dragons", "barons", "towers", "voidgrubs"]
+FLAG_OBJECTIVES = ["heralds", "first_blood", "first_turret", "first_three_epic_camps", "first_three_kills"]
+TIME_FIELD = "snapshot_time_sec"
+
+# Widget keys of the objective inputs
+COUNT_WIDGETS = {"barons": "b{team}", "towers": "t{team}", "voidgrubs": "voidgrubs_{team}"}
+FLAG_WIDGETS = {
+    "heralds": "herald_{team}",
+    "first_blood": "fb{team}",
+    "first_turret": "first_turret_{team}",
+    "first_three_epic_camps": "first_three_epic_camps_{team}",
+    "first_three_kills": "first_three_kills_{team}",
+}
+STAT_WIDGETS = {"kills": "k", "deaths": "d", "assists": "a", "total_minions_killed": "cs", "level": "level"}
+WIDGET_TEAMS = {100: "t1", 200: "t2"}
+
+
+def yes_no(flag):
+    return "Yes" if flag else "No"
+
+
+def dragon_type_counts(dragon_types):
+    """Count dragon codes per type over the last (slot) axis."""
+    return (dragon_types[..., None] == np.arange(1, len(DRAGON_TYPES) + 1)).sum(axis=-2)
+
+
+def plain_number(value):
+    """A NumPy scalar as an int when it is whole, else as a float."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def player_slot(team, role):
+    """Player index (0..9) of a team's role; team 100 takes slots 0..4."""
+    return TEAMS.index(team) * 5 + roles.index(role)
+
+
+class GameState:
+    """One game moment; see the module docstring for the layout."""
+
+    __slots__ = ("stats", "champions", "counts", "flags", "dragon_types", "game_time", "platform_id", "rank")
+
+    def __init__(self, platform_id="NA1", rank="Gold"):
+        # Floats, so snapshot values reach the model as given (e.g. an averaged creep score)
+        self.stats = np.zeros((len(PLAYER_STATS), N_PLAYERS), dtype=np.float64)
+        self.stats[PLAYER_STATS.index("level")] = 1
+        self.champions = [champion_list[0]] * N_PLAYERS
+        self.counts = np.zeros((len(TEAMS), len(COUNT_OBJECTIVES)), dtype=np.float64)
+        self.flags = np.zeros((len(TEAMS), len(FLAG_OBJECTIVES)), dtype=bool)
+        # 0 = no dragon, otherwise 1 + index into DRAGON_TYPES, in the order taken
+        self.dragon_types = np.zeros((len(TEAMS), DRAGON_SLOTS), dtype=np.int8)
+        self.game_time = 0.0
+        self.platform_id = platform_id
+        self.rank = rank
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return (
+            self.game_time == other.game_time
+            and self.platform_id == other.platform_id
+            and self.rank == other.rank
+            and self.champions == other.champions
+            and np.array_equal(self.stats, other.stats)
+            and np.array_equal(self.counts, other.counts)
+            and np.array_equal(self.flags, other.flags)
+            and np.array_equal(self.dragon_types, other.dragon_types)
+        )
+
+    __hash__ = None
+
+    def copy(self):
+        game = GameState(self.platform_id, self.rank)
+        game.stats[:] = self.stats
+        game.champions = list(self.champions)
+        game.counts[:] = self.counts
+        game.flags[:] = self.flags
+        game.dragon_types[:] = self.dragon_types
+        game.game_time = self.game_time
+        return game
+
+    def stat(self, name):
+        """Per-player values of one stat (a view, p1..p10)."""
+        return self.stats[PLAYER_STATS.index(name)]
+
+    def objective(self, name, team):
+        """A count or a 0/1 flag for one team."""
+        t = TEAMS.index(team)
+        if name in COUNT_OBJECTIVES:
+            return plain_number(self.counts[t, COUNT_OBJECTIVES.index(name)])
+        return int(self.flags[t, FLAG_OBJECTIVES.index(name)])
+
+    def set_dragons(self, team, dragon_names, count=True):
+        """Set a team's dragons from type names (in slot order); the count follows unless ``count`` is False."""
+        t = TEAMS.index(team)
+        codes = [DRAGON_TYPES.index(d) + 1 for d in dragon_names if d in DRAGON_TYPES][:DRAGON_SLOTS]
+        self.dragon_types[t] = 0
+        self.dragon_types[t, :len(codes)] = codes
+        if count:
+            self.counts[t, COUNT_OBJECTIVES.index("dragons")] = len(codes)
+
+    def dragon_type_counts(self):
+        """Dragons taken per team and type, as a (2, len(DRAGON_TYPES)) array."""
+        return dragon_type_counts(self.dragon_types)
+
+    # === Flat snapshot dicts ===
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        game = cls(snapshot.get("platform_id"), snapshot.get("rank"))
+        for s, stat in enumerate(PLAYER_STATS):
+            game.stats[s] = [snapshot.get(f"{stat}_p{i+1}", 0) for i in range(N_PLAYERS)]
+        game.champions = [snapshot.get(f"champion_p{i+1}") for i in range(N_PLAYERS)]
+        for t, team in enumerate(TEAMS):
+            game.counts[t] = [snapshot.get(f"{name}_{team}", 0) for name in COUNT_OBJECTIVES]
+            game.flags[t] = [snapshot.get(f"{name}_{team}", 0) for name in FLAG_OBJECTIVES]
+            # Snapshots may carry only the dragons count, which is kept as given
+            dragons = []
+            for d in DRAGON_TYPES:
+                dragons.extend([d] * int(snapshot.get(f"{DRAGON_FIELD_PREFIXES[d]}_dragon_{team}", 0)))
+            game.set_dragons(team, dragons, count=False)
+        game.game_time = float(snapshot.get(TIME_FIELD, 0))
+        return game
+
+    def to_snapshot(self):
+        snapshot = {}
+        type_counts = self.dragon_type_counts()
+        for i in range(N_PLAYERS):
+            for s, stat in enumerate(PLAYER_STATS):
+                snapshot[f"{stat}_p{i+1}"] = plain_number(self.stats[s, i])
+            snapshot[f"champion_p{i+1}"] = self.champions[i]
+        for t, team in enumerate(TEAMS):
+            for o, name in enumerate(COUNT_OBJECTIVES):
+                snapshot[f"{name}_{team}"] = plain_number(self.counts[t, o])
+            for o, name in enumerate(FLAG_OBJECTIVES):
+                snapshot[f"{name}_{team}"] = int(self.flags[t, o])
+            for d, name in enumerate(DRAGON_TYPES):
+                snapshot[f"{DRAGON_FIELD_PREFIXES[name]}_dragon_{team}"] = int(type_counts[t, d])
+        snapshot[TIME_FIELD] = self.game_time
+        snapshot["platform_id"] = self.platform_id
+        snapshot["rank"] = self.rank
+        return snapshot
+
+    # === Streamlit widget state ===
+
+    @classmethod
+    def from_widget_state(cls, state, platform_id, rank):
+        """Read the app's input widgets (any mapping keyed like ``st.session_state``)."""
+        game = cls(platform_id, rank)
+        for team, team_id in WIDGET_TEAMS.items():
+            t = TEAMS.index(team)
+            for role in roles:
+                i = player_slot(team, role)
+                for s, stat in enumerate(PLAYER_STATS):
+                    default = 1 if stat == "level" else 0
+                    game.stats[s, i] = state.get(f"{STAT_WIDGETS[stat]}_{team_id}_{role}", default)
+                game.champions[i] = state.get(f"champ_{team_id}_{role}", champion_list[0])
+            game.set_dragons(team, [state.get(f"drag{team}_{k}", "None") for k in range(DRAGON_SLOTS)])
+            for name, key in COUNT_WIDGETS.items():
+                game.counts[t, COUNT_OBJECTIVES.index(name)] = state.get(key.format(team=team), 0)
+            for name, key in FLAG_WIDGETS.items():
+                game.flags[t, FLAG_OBJECTIVES.index(name)] = state.get(key.format(team=team), "No") == "Yes"
+        game.game_time = state.get("snapshot_time_min", 0) * 60 + state.get("snapshot_time_sec_partial", 0)
+        return game
+
+    def widget_state(self):
+        """The app's widget values for this state, ready for ``st.session_state.update``."""
+        state = {}
+        for team, team_id in WIDGET_TEAMS.items():
+            t = TEAMS.index(team)
+            for role in roles:
+                i = player_slot(team, role)
+                for s, stat in enumerate(PLAYER_STATS):
+                    state[f"{STAT_WIDGETS[stat]}_{team_id}_{role}"] = int(self.stats[s, i])
+                state[f"champ_{team_id}_{role}"] = self.champions[i]
+            for k in range(DRAGON_SLOTS):
+                code = self.dragon_types[t, k]
+                state[f"drag{team}_{k}"] = DRAGON_TYPES[code - 1] if code else "None"
+            for name, key in COUNT_WIDGETS.items():
+                state[key.format(team=team)] = int(self.counts[t, COUNT_OBJECTIVES.index(name)])
+            for name, key in FLAG_WIDGETS.items():
+                state[key.format(team=team)] = yes_no(self.flags[t, FLAG_OBJECTIVES.index(name)])
+        state["snapshot_time_min"] = int(self.game_time // 60)
+        state["snapshot_time_sec_partial"] = self.game_time % 60
+        return state
+
+
+class GameStateLayout:
+    """``GameState`` arrays -> column indices of a ``FeatureEncoder`` schema, compiled once.
+
+    Columns split into dynamic ones (stats, objectives, game time), which
+    change every poll, and static ones (lineup class counts, platform and
+    rank one-hots), which are fixed for a whole game.
+    """
+
+    def __init__(self, encoder):
+        self.encoder = encoder
+        index = encoder.column_index
+
+        def compile_columns(names):
+            columns = np.array([index.get(name, -1) for name in names.flat], dtype=np.intp)
+            missing = [name for name, col in zip(names.flat, columns) if col < 0]
+            return columns, columns >= 0, missing
+
+        stat_names = np.array([[f"{stat}_p{i+1}" for i in range(N_PLAYERS)] for stat in PLAYER_STATS])
+        count_names = np.array([[f"{name}_{team}" for name in COUNT_OBJECTIVES] for team in TEAMS])
+        flag_names = np.array([[f"{name}_{team}" for name in FLAG_OBJECTIVES] for team in TEAMS])
+        dragon_names = np.array([[f"{DRAGON_FIELD_PREFIXES[d]}_dragon_{team}" for d in DRAGON_TYPES] for team in TEAMS])
+        stat_columns, self.stat_valid, missing_stats = compile_columns(stat_names)
+        count_columns, self.count_valid, missing_counts = compile_columns(count_names)
+        flag_columns, self.flag_valid, missing_flags = compile_columns(flag_names)
+        dragon_columns, self.dragon_valid, missing_dragons = compile_columns(dragon_names)
+        self.time_column = index.get(TIME_FIELD)
+        # Model columns of the encode_dynamic matrix, in its column order
+        self.dynamic_columns = np.concatenate([
+            stat_columns[self.stat_valid], count_columns[self.count_valid], flag_columns[self.flag_valid],
+            dragon_columns[self.dragon_valid],
+            np.array([] if self.time_column is None else [self.time_column], dtype=np.intp),
+        ])
+        # Same report as the dict path gives for fields with no column
+        self.missing = (missing_stats + missing_counts + missing_flags + missing_dragons
+                        + ([] if self.time_column is not None else [TIME_FIELD]))
+
+    def encode_dynamic(self, games, out=None):
+        """The dynamic columns only, as an (n, len(dynamic_columns)) matrix."""
+        n = len(games)
+        if out is None:
+            out = np.empty((n, len(self.dynamic_columns)), dtype=np.float64)
+        if n == 0:
+            return out
+        k = 0
+        blocks = (
+            (np.stack([g.stats for g in games]), self.stat_valid),
+            (np.stack([g.counts for g in games]), self.count_valid),
+            (np.stack([g.flags for g in games]), self.flag_valid),
+            (dragon_type_counts(np.stack([g.dragon_types for g in games])), self.dragon_valid),
+        )
+        for block, valid in blocks:
+            width = int(valid.sum())
+            out[:, k:k + width] = block.reshape(n, -1)[:, valid]
+            k += width
+        if self.time_column is not None:
+            out[:, k] = [g.game_time for g in games]
+        return out
+
+    def encode_static(self, games, out):
+        """Write the static columns into zeroed rows of ``out``; return the unmapped names."""
+        encoder = self.encoder
+        composition = encoder.composition
+        unmapped = set()
+        champion_ids = np.empty((len(games), N_PLAYERS), dtype=np.intp)
+        for r, game in enumerate(games):
+            for field, value in (("platform_id", game.platform_id), ("rank", game.rank)):
+                if value is None:
+                    continue
+                col = encoder.categorical_index[field].get(normalize_category(value))
+                if col is None:
+                    unmapped.add(f"{field}_{value}")
+                else:
+                    out[r, col] = 1
+            for i, name in enumerate(game.champions):
+                champion_ids[r, i] = composition.champion_id(name)
+                if champion_ids[r, i] == composition.unknown_id:
+                    unmapped.add(f"champion_p{i+1}_{name}")
+        unmapped.update(composition.scatter(out, champion_ids))
+        return unmapped
+
+    def encode(self, games, out=None):
+        """Encode states into a matrix; return (X, sorted unmapped names).
+
+        Lifetime of X as in ``FeatureEncoder.encode_batch``.
+        """
+        n = len(games)
+        if out is None:
+            out = self.encoder.buffer(n)
+        else:
+            out = out[:n]
+            out.fill(0)
+        if n == 0:
+            return out, []
+
+        out[:, self.dynamic_columns] = self.encode_dynamic(games)
+        unmapped = self.encode_static(games, out)
+        unmapped.update(self.missing)
+        return out, sorted(unmapped)
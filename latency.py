@@ -0,0 +1,97 @@
+"""Rolling per-stage latency statistics for the app and the live pipeline.
+
+Stages are timed with ``timed("stage")`` around the code in question and
+kept as a bounded window of recent samples per stage, summarized as
+p50/p95/p99. The process-wide ``stage_timings`` can be exported as JSON or
+in the Prometheus text format.
+
+Stages used in this repo: ``fetch`` (LiveClientData request), ``decode``
+(JSON decode), ``reduce`` (event reduction), ``state_write`` (session-state
+writes), ``wallpaper`` (background CSS), ``encode`` (feature building),
+``inference`` (model) and ``render`` (one Streamlit script run).
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+PERCENTILES = [50, 95, 99]
+
+
+class StageTimings:
+    """Recent latency samples per stage, bounded to ``window`` samples each."""
+
+    def __init__(self, window=2048):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._counts[stage] = 0
+                self._totals[stage] = 0.0
+            samples.append(seconds)
+            self._counts[stage] += 1
+            self._totals[stage] += seconds
+
+    @contextmanager
+    def time(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+
+    def summary(self):
+        """{stage: {count, total_s, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}.
+
+        ``count`` and ``total_s`` cover the whole process lifetime; the other
+        statistics cover the recent window.
+        """
+        with self._lock:
+            stages = {
+                stage: (np.fromiter(samples, dtype=np.float64), self._counts[stage], self._totals[stage])
+                for stage, samples in self._samples.items()
+            }
+        summary = {}
+        for stage, (samples, count, total) in sorted(stages.items()):
+            ms = samples * 1000
+            stats = {"count": count, "total_s": total, "mean_ms": float(ms.mean()), "max_ms": float(ms.max())}
+            for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+                stats[f"p{p}_ms"] = float(value)
+            summary[stage] = stats
+        return summary
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self, name="lol_predictor_stage_latency_seconds"):
+        """Prometheus text exposition, one summary metric labelled by stage."""
+        lines = [
+            f"# HELP {name} Latency of each prediction pipeline stage.",
+            f"# TYPE {name} summary",
+        ]
+        for stage, stats in self.summary().items():
+            for p in PERCENTILES:
+                lines.append(f'{name}{{stage="{stage}",quantile="{p / 100:g}"}} {stats[f"p{p}_ms"] / 1000:.9g}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["total_s"]:.9g}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+stage_timings = StageTimings()
+timed = stage_timings.time
@@ -0,0 +1,216 @@
+"""Pooled access to the Riot LiveClientData API and a background live poller."""
+import threading
+import time
+from collections import namedtuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from latency import timed
+from live_data import EventReducer, game_from_live_data
+
+# Disable SSL warnings for localhost calls to LiveClientData
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+DEFAULT_BASE_URL = "https://127.0.0.1:2999"
+
+LiveUpdate = namedtuple("LiveUpdate", ["version", "fetched_at", "live_data", "game", "winner", "proba"])
+
+
+class LiveClient:
+    """Keep-alive HTTP session against one LiveClientData endpoint."""
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, timeout=1):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.active_player_name = None
+
+    def get(self, path, params=None):
+        """GET a LiveClientData path; return the decoded JSON or None."""
+        try:
+            with timed("fetch"):
+                r = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+            if r.status_code == 200:
+                with timed("decode"):
+                    return r.json()
+            else:
+                return None
+        except Exception:
+            return None
+
+    def get_all_game_data(self):
+        return self.get("/liveclientdata/allgamedata")
+
+    def get_event_data(self, event_id=0):
+        """Events with ``EventID >= event_id``, or None."""
+        data = self.get("/liveclientdata/eventdata", params={"eventID": event_id})
+        return None if data is None else data.get("Events", [])
+
+    def get_incremental_game_data(self, event_id):
+        """An ``allgamedata``-shaped payload carrying only events from ``event_id`` on.
+
+        Fetches ``playerlist``, ``gamestats`` and ``eventdata?eventID=`` instead
+        of the full ``allgamedata`` document. Every payload names the active
+        player, whose side the ``GameEnd`` result refers to, so any stretch
+        of recorded payloads can be labelled; ``activeplayername`` is
+        fetched again from event 0 (a new game) and until it succeeds.
+        """
+        players = self.get("/liveclientdata/playerlist")
+        if players is None:
+            return None
+        game_data = self.get("/liveclientdata/gamestats")
+        if game_data is None:
+            return None
+        events = self.get_event_data(event_id)
+        if events is None:
+            return None
+        live_data = {"allPlayers": players, "gameData": game_data, "events": {"Events": events}}
+        if event_id == 0 or self.active_player_name is None:
+            name = self.get("/liveclientdata/activeplayername")
+            self.active_player_name = name if isinstance(name, str) else None
+        if self.active_player_name is not None:
+            live_data["activePlayer"] = {"summonerName": self.active_player_name}
+        return live_data
+
+    def close(self):
+        self.session.close()
+
+
+class LivePoller:
+    """Background worker that polls the live client and scores every fresh state.
+
+    Each successful poll turns the payload into a ``GameState`` and scores
+    it; the result is published as ``latest``. While the client is
+    unreachable the wait between polls doubles up to ``max_backoff`` seconds.
+
+    In incremental mode (the default) only events newer than the reducer's
+    last EventID are fetched; a game clock that runs backwards means a new
+    game, which resets the reducer.
+
+    Every ``start`` gets its own stop event, so a run that is still winding
+    down after ``stop`` can never be revived by the next ``start``.
+    ``stop`` may be called from the poller thread itself (e.g. from
+    ``on_update``); it then only signals the run to end.
+    """
+
+    def __init__(self, client, predictor, interval=2.0, max_backoff=30.0,
+                 platform_id="NA1", rank="Gold", on_update=None, incremental=True):
+        self.client = client
+        self.predictor = predictor
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.platform_id = platform_id
+        self.rank = rank
+        self.on_update = on_update
+        self.incremental = incremental
+        self.reducer = EventReducer()
+        self.game_time = 0
+        self._resync = False
+
+        self.failures = 0
+        self.next_delay = interval
+        self._latest = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+
+    @property
+    def latest(self):
+        with self._lock:
+            return self._latest
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        with self._run_lock:
+            if self.is_running:
+                return
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), name="live-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Signal the current run to end and wait up to ``timeout`` seconds for it."""
+        with self._run_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stop.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._run_lock:
+            if self._thread is thread and not thread.is_alive():
+                self._thread = None
+
+    def poll_once(self):
+        """Fetch and score one payload; return the new LiveUpdate or None.
+
+        Safe to call from other threads while the poller runs; polls are
+        serialized so the reducer sees events in order.
+        """
+        with self._poll_lock:
+            return self._poll()
+
+    def request_resync(self):
+        """Fetch the full event list on the next incremental poll (e.g. after a recorder gap)."""
+        self._resync = True
+
+    def _poll(self):
+        if self.incremental:
+            resync, self._resync = self._resync, False
+            live_data = self.client.get_incremental_game_data(0 if resync else self.reducer.last_event_id + 1)
+            if live_data is None and resync:
+                self._resync = True
+        else:
+            live_data = self.client.get_all_game_data()
+        if live_data is None:
+            return None
+
+        game_time = live_data.get("gameData", {}).get("gameTime", 0)
+        if game_time < self.game_time:
+            self.reducer.reset()
+            if self.incremental:
+                live_data = self.client.get_incremental_game_data(0)
+                if live_data is None:
+                    return None
+        self.game_time = game_time
+
+        with timed("reduce"):
+            game = game_from_live_data(live_data, self.reducer, self.platform_id, self.rank)
+        winners, proba = self.predictor.predict_games([game])
+
+        with self._lock:
+            self._version += 1
+            update = LiveUpdate(self._version, time.time(), live_data, game, winners[0], proba[0])
+            self._latest = update
+        if self.on_update is not None:
+            self.on_update(update)
+        return update
+
+    def _backoff_delay(self):
+        return min(self.max_backoff, self.interval * (2 ** self.failures))
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                update = self.poll_once()
+            except Exception:
+                update = None
+            if update is None:
+                self.failures += 1
+                self.next_delay = self._backoff_delay()
+            else:
+                self.failures = 0
+                self.next_delay = self.interval
+            stop.wait(self.next_delay)
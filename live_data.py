@@ -0,0 +1,252 @@
+"""LiveClientData payload handling shared by the app and headless workers.
+
+Payloads are turned into a ``GameState`` (see ``game_state``); nothing here
+imports Streamlit.
+"""
+from champions import champion_list, roles
+from game_state import COUNT_OBJECTIVES, DRAGON_TYPES, FLAG_OBJECTIVES, GameState, player_slot
+
+dragon_types_list = DRAGON_TYPES
+
+dragon_type_map = {
+    "INFERNAL": "Infernal", "FIRE": "Infernal",
+    "MOUNTAIN": "Mountain", "EARTH": "Mountain",
+    "OCEAN": "Ocean", "WATER": "Ocean",
+    "CLOUD": "Cloud", "AIR": "Cloud",
+    "HEXTECH": "Hextech",
+    "CHEMTECH": "Chemtech",
+    "ELDER": "Elder"
+}
+
+epic_camps = ["dragon", "riftherald", "baron"]
+
+
+def is_epic_camp(event_name):
+    event_name = event_name.lower()
+    return any(ec in event_name for ec in epic_camps)
+
+
+def team_of(player):
+    return 100 if player.get("team", "").upper() == "ORDER" else 200
+
+
+class EventReducer:
+    """Folds LiveClientData events into the objective counters incrementally.
+
+    The reducer remembers the last EventID it processed, so feeding it the
+    same events again is a no-op and each poll only costs the new events.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.last_event_id = -1
+        self.team_by_name = {}
+
+        self.barons = {100: 0, 200: 0}
+        self.towers = {100: 0, 200: 0}
+        self.heralds = {100: False, 200: False}
+        self.voidgrubs = {100: 0, 200: 0}
+        self.dragon_counts = {100: {d: 0 for d in dragon_types_list}, 200: {d: 0 for d in dragon_types_list}}
+        self.first_blood_team = None
+        self.first_turret_team = None
+
+        self.camp_counter = {100: 0, 200: 0}
+        self.kill_counter = {100: 0, 200: 0}
+        self.first_three_epic_camps_winner = None
+        self.first_three_kills_winner = None
+
+    def set_players(self, players):
+        """Index summoner names by team so event attribution is a dict lookup."""
+        self.team_by_name = {p.get("summonerName"): team_of(p) for p in players}
+
+    def apply(self, events):
+        """Fold every event newer than ``last_event_id``; events without an EventID are always folded."""
+        for e in events:
+            event_id = e.get("EventID")
+            if event_id is not None:
+                if event_id <= self.last_event_id:
+                    continue
+                self.last_event_id = event_id
+            self.apply_event(e)
+
+    def apply_event(self, e):
+        ev_name = e.get("EventName", "")
+        killer_team = e.get("killerTeam")
+        if not killer_team:
+            killer_name = e.get("KillerName") or e.get("Acer")
+            killer_team = self.team_by_name.get(killer_name)
+
+        if killer_team not in (100, 200):
+            return
+
+        if ev_name == "ChampionKill" and self.first_blood_team is None:
+            self.first_blood_team = killer_team
+
+        if ev_name == "DragonKill":
+            raw_type = e.get("DragonType", "") or e.get("monsterType", "")
+            dt = dragon_type_map.get(raw_type.strip().upper(), None)
+            if dt:
+                self.dragon_counts[killer_team][dt] += 1
+
+        elif ev_name in ("RiftHeraldKill", "HeraldKill"):
+            self.heralds[killer_team] = True
+
+        elif ev_name == "BaronKill":
+            self.barons[killer_team] += 1
+
+        elif ev_name == "TurretKilled":
+            self.towers[killer_team] += 1
+            if self.first_turret_team is None:
+                self.first_turret_team = killer_team
+
+        elif ev_name == "VoidGrubKill":
+            self.voidgrubs[killer_team] += 1
+
+        elif ev_name == "ChampionKill":
+            if self.kill_counter[killer_team] < 3:
+                self.kill_counter[killer_team] += 1
+                if self.kill_counter[killer_team] == 3 and self.first_three_kills_winner is None:
+                    self.first_three_kills_winner = killer_team
+
+        if is_epic_camp(ev_name):
+            if self.camp_counter[killer_team] < 3:
+                self.camp_counter[killer_team] += 1
+                if self.camp_counter[killer_team] == 3 and self.first_three_epic_camps_winner is None:
+                    self.first_three_epic_camps_winner = killer_team
+
+    def write_game(self, game):
+        """Write the objective counters into a ``GameState``."""
+        for t, team in enumerate((100, 200)):
+            counts = {"barons": self.barons[team], "towers": self.towers[team], "voidgrubs": self.voidgrubs[team]}
+            for name, value in counts.items():
+                game.counts[t, COUNT_OBJECTIVES.index(name)] = value
+            flags = {
+                "heralds": self.heralds[team],
+                "first_blood": self.first_blood_team == team,
+                "first_turret": self.first_turret_team == team,
+                "first_three_epic_camps": self.first_three_epic_camps_winner == team,
+                "first_three_kills": self.first_three_kills_winner == team,
+            }
+            for name, value in flags.items():
+                game.flags[t, FLAG_OBJECTIVES.index(name)] = value
+
+            expanded = []
+            for dt in dragon_types_list:
+                expanded.extend([dt] * self.dragon_counts[team][dt])
+            game.set_dragons(team, expanded)
+
+
+def game_from_live_data(live_data, reducer=None, platform_id="NA1", rank="Gold"):
+    """Build a ``GameState`` from a LiveClientData payload.
+
+    Pass a persistent ``EventReducer`` to fold in only events it has not seen
+    yet; without one, the payload's whole event list is replayed.
+    """
+    game = GameState(platform_id, rank)
+    participants = list(live_data.get("allPlayers", []))
+    active_player = live_data.get("activePlayer", None)
+
+    # Add active player manually if not already in allPlayers (the name may be a Riot ID)
+    known_names = {p.get(key) for p in participants for key in ("summonerName", "riotId", "riotIdGameName")}
+    known_names.discard(None)
+    if active_player and active_player.get("summonerName") not in known_names:
+        active_stats = active_player.get("championStats", {})
+        active_scores = active_player.get("scores", {})
+        active_data = {
+            "summonerName": active_player.get("summonerName", "You"),
+            "championName": active_player.get("championName", "Unknown"),
+            "level": active_stats.get("level", 1),
+            "position": "",  # Riot doesn't provide this here
+            "team": "ORDER",  # Default guess (red side)
+            "scores": active_scores
+        }
+        participants.append(active_data)
+
+    role_map_live_to_ui = {
+        "TOP": "Top",
+        "JUNGLE": "Jungle",
+        "MIDDLE": "Mid",
+        "MID": "Mid",
+        "BOTTOM": "ADC",
+        "ADC": "ADC",
+        "SUPPORT": "Support",
+        "UTILITY": "Support"
+    }
+
+    team_map = {100: "t1", 200: "t2"}
+
+    def map_team(team_str):
+        team_str = team_str.upper()
+        return 100 if team_str == "ORDER" else 200 if team_str == "CHAOS" else None
+
+    role_order_map = {role: i for i, role in enumerate(roles)}
+
+    def sort_key(p):
+        team_num = map_team(p.get("team", ""))
+        raw_role = p.get("position", "").upper()
+        ui_role = role_map_live_to_ui.get(raw_role, None)
+        team_sort = team_num if team_num in team_map else 99
+        role_sort = role_order_map.get(ui_role, 99) if ui_role else 99
+        return (team_sort, role_sort)
+
+    participants.sort(key=sort_key)
+
+    role_assigned = {"t1": set(), "t2": set()}
+
+    for p in participants:
+        team_num = map_team(p.get("team", ""))
+        if team_num not in team_map:
+            continue
+        team_id = team_map[team_num]
+
+        raw_role = p.get("position", "").upper()
+        ui_role = role_map_live_to_ui.get(raw_role)
+
+        if ui_role not in roles or ui_role in role_assigned[team_id]:
+            for r in roles:
+                if r not in role_assigned[team_id]:
+                    ui_role = r
+                    break
+            else:
+                continue
+
+        role_assigned[team_id].add(ui_role)
+        i = player_slot(team_num, ui_role)
+
+        scores = p.get("scores", {})
+        champ_name = p.get("championName", "Unknown")
+        if champ_name not in champion_list:
+            champ_name = champion_list[0]
+
+        game.stats[:, i] = (
+            scores.get("kills", 0),
+            scores.get("deaths", 0),
+            scores.get("assists", 0),
+            scores.get("creepScore", 0),
+            p.get("level", 1),
+        )
+        game.champions[i] = champ_name
+
+    if reducer is None:
+        reducer = EventReducer()
+    reducer.set_players(participants)
+    reducer.apply(live_data.get("events", {}).get("Events", []))
+    reducer.write_game(game)
+
+    game.game_time = float(live_data.get("gameData", {}).get("gameTime", 0))
+    return game
+
+
+def fill_inputs_from_live_data(live_data, state, reducer=None):
+    """Write a LiveClientData payload into ``state`` using the UI widget keys.
+
+    ``state`` is ``st.session_state`` in the app, or any dict for headless use.
+    """
+    state.update(game_from_live_data(live_data, reducer).widget_state())
+
+
+def snapshot_from_state(state, platform_id, rank):
+    """Build a predictor snapshot from widget-keyed state."""
+    return GameState.from_widget_state(state, platform_id, rank).to_snapshot()
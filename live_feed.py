@@ -0,0 +1,115 @@
+"""One shared live poller per process, fanned out to any number of viewers.
+
+Every Streamlit session (and any overlay or bot in the same process)
+subscribes to the same ``LiveFeed`` instead of polling the client itself.
+Each decoded state and prediction is published once as an immutable
+``LiveUpdate``; subscribers keep only a reference to it or its version.
+The poller runs while at least one subscription is open.
+"""
+import threading
+import time
+
+
+class Subscription:
+    """A viewer's handle on a ``LiveFeed``."""
+
+    def __init__(self, feed, callback=None, idle_timeout=None):
+        self.feed = feed
+        self.callback = callback
+        self.idle_timeout = idle_timeout
+        self.seen_version = 0
+        self.touched = time.monotonic()
+        self.closed = False
+
+    def touch(self):
+        """Mark the subscriber as alive (see ``idle_timeout``)."""
+        self.touched = time.monotonic()
+
+    def is_idle(self, now):
+        return self.idle_timeout is not None and now - self.touched > self.idle_timeout
+
+    def poll(self):
+        """The latest update if it is newer than the last one seen, else None."""
+        self.touch()
+        update = self.feed.latest
+        if update is None or update.version <= self.seen_version:
+            return None
+        self.seen_version = update.version
+        return update
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+
+class LiveFeed:
+    """Publishes a ``LivePoller``'s updates once to every subscriber.
+
+    Subscriptions with an ``idle_timeout`` that are not touched in time are
+    dropped, so sessions that go away without unsubscribing do not keep the
+    poller running.
+    """
+
+    def __init__(self, poller):
+        self.poller = poller
+        self.poller.on_update = self._publish
+        self.published = 0
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    @property
+    def latest(self):
+        return self.poller.latest
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def subscribe(self, callback=None, idle_timeout=None):
+        """Open a subscription; ``callback(update)`` runs on the poller thread."""
+        subscription = Subscription(self, callback, idle_timeout)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self.poller.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscription.closed = True
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            # Under the lock, so a concurrent subscribe cannot be left without a poller
+            if not self._subscriptions:
+                self.poller.stop(timeout=0)
+
+    def refresh(self):
+        """Poll once right now (e.g. a manual load) and publish the result."""
+        return self.poller.poll_once()
+
+    def wait_for_update(self, after_version=0, timeout=None):
+        """Block until an update newer than ``after_version`` is published."""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self.latest is not None and self.latest.version > after_version, timeout
+            )
+        return self.latest
+
+    def _publish(self, update):
+        now = time.monotonic()
+        with self._changed:
+            self.published += 1
+            stale = [s for s in self._subscriptions if s.is_idle(now)]
+            for s in stale:
+                s.closed = True
+                self._subscriptions.remove(s)
+            callbacks = [s.callback for s in self._subscriptions if s.callback is not None]
+            if stale and not self._subscriptions:
+                self.poller.stop(timeout=0)
+            self._changed.notify_all()
+
+        for callback in callbacks:
+            try:
+                callback(update)
+            except Exception:
+                pass
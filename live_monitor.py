@@ -0,0 +1,350 @@
+"""Concurrent monitoring of several LiveClientData endpoints on one event loop.
+
+Each endpoint (another machine, or a forwarded port) gets a lightweight
+asyncio task with its own keep-alive ``HTTPConnection``, reducer, timeout
+and backoff, so a slow or dead client only delays its own next poll.
+Fresh states from all games are scored together: a single scorer task
+drains whatever arrived since its last run into one ``predict_games``
+call, which runs in the loop's default executor so polling continues
+while a batch is scored. A batch that fails to score is recorded as the
+error of its games and the scorer moves on. There is no thread or HTTP
+session per game; ``start()`` runs the whole monitor on one background
+thread.
+
+    python live_monitor.py https://127.0.0.1:2999 scrim=https://10.0.0.7:2999
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from async_http import HTTPConnection
+from latency import timed
+from live_client import LiveUpdate
+from live_data import EventReducer, game_from_live_data
+
+
+def parse_endpoint(spec):
+    """``"name=url"`` or ``"url"`` -> (name, url); the name defaults to host:port."""
+    name, sep, url = spec.partition("=")
+    if not sep or "://" in name:
+        url = spec
+        name = url.split("://", 1)[-1].rstrip("/")
+    return name, url
+
+
+class MonitoredGame:
+    """Per-endpoint state: connection, reducer, backoff and the latest scored update."""
+
+    def __init__(self, name, url, platform_id, rank):
+        self.name = name
+        self.url = url
+        self.platform_id = platform_id
+        self.rank = rank
+        self.connection = HTTPConnection(url)
+        self.reducer = EventReducer()
+        self.game_time = 0
+        self.polls = 0
+        self.failures = 0
+        self.next_delay = 0.0
+        self.last_error = None
+        self.score_error = None
+        self.latest = None
+        self.version = 0
+        self.task = None
+
+    @property
+    def status(self):
+        if self.failures:
+            return "unreachable"
+        return "live" if self.latest is not None else "waiting"
+
+    def row(self, now=None):
+        """One dashboard row."""
+        now = time.time() if now is None else now
+        update = self.latest
+        row = {
+            "game": self.name, "endpoint": self.url, "status": self.status,
+            "game_time": None, "proba_100": None, "proba_200": None, "favoured": None,
+            "updated_s_ago": None, "failures": self.failures, "retry_in_s": None,
+            "error": self.last_error or self.score_error,
+        }
+        if self.failures:
+            row["retry_in_s"] = self.next_delay
+        if update is not None:
+            row.update(
+                game_time=update.game.game_time, proba_100=float(update.proba[0]), proba_200=float(update.proba[1]),
+                favoured=int(update.winner), updated_s_ago=now - update.fetched_at,
+            )
+        return row
+
+
+class LiveMonitor:
+    """Polls many LiveClientData endpoints concurrently and scores them in batches.
+
+    ``on_update(name, update)`` is called on the monitor's loop for every
+    scored ``LiveUpdate``. Endpoints can be added or removed while running;
+    from other threads use ``set_endpoints``.
+    """
+
+    def __init__(self, predictor, interval=2.0, timeout=1.0, max_backoff=30.0,
+                 platform_id="NA1", rank="Gold", incremental=True, on_update=None):
+        self.predictor = predictor
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.platform_id = platform_id
+        self.rank = rank
+        self.incremental = incremental
+        self.on_update = on_update
+
+        self.games = {}
+        self.batches = 0
+        self._pending = {}
+        self._wake = None
+        self._loop = None
+        self._task = None
+        self._thread = None
+
+    # === Endpoints ===
+
+    def add_endpoint(self, url, name=None, platform_id=None, rank=None):
+        """Start watching ``url`` (must run on the monitor's loop)."""
+        name = name or parse_endpoint(url)[0]
+        if name in self.games:
+            return self.games[name]
+        game = MonitoredGame(name, url, platform_id or self.platform_id, rank or self.rank)
+        self.games[name] = game
+        game.task = asyncio.get_running_loop().create_task(self._watch(game))
+        return game
+
+    def remove_endpoint(self, name):
+        game = self.games.pop(name, None)
+        if game is not None:
+            game.task.cancel()
+            game.connection.close()
+            self._pending.pop(name, None)
+
+    def set_endpoints(self, specs):
+        """Watch exactly ``specs`` (``"name=url"`` or ``"url"``); callable from any thread."""
+        wanted = dict(parse_endpoint(spec) for spec in specs)
+
+        def apply():
+            for name in list(self.games):
+                if wanted.get(name) != self.games[name].url:
+                    self.remove_endpoint(name)
+            for name, url in wanted.items():
+                self.add_endpoint(url, name)
+
+        if self._loop is None:
+            raise RuntimeError("Monitor is not running")
+        self._loop.call_soon_threadsafe(apply)
+
+    def rows(self):
+        """Dashboard rows for every watched game, in the order they were added."""
+        now = time.time()
+        return [game.row(now) for game in list(self.games.values())]
+
+    # === Polling ===
+
+    async def _fetch(self, game):
+        """One allgamedata-shaped payload over the game's connection, or None."""
+        connection = game.connection
+        if not self.incremental:
+            with timed("fetch"):
+                return await connection.get_json("/liveclientdata/allgamedata")
+        with timed("fetch"):
+            players = await connection.get_json("/liveclientdata/playerlist")
+            if players is None:
+                return None
+            game_data = await connection.get_json("/liveclientdata/gamestats")
+            if game_data is None:
+                return None
+            events = await connection.get_json(
+                "/liveclientdata/eventdata", {"eventID": game.reducer.last_event_id + 1}
+            )
+            if events is None:
+                return None
+        return {"allPlayers": players, "gameData": game_data, "events": events}
+
+    async def _poll(self, game):
+        live_data = await self._fetch(game)
+        if live_data is None:
+            return False
+
+        # A game clock that runs backwards means a new game on this endpoint
+        game_time = live_data.get("gameData", {}).get("gameTime", 0)
+        if game_time < game.game_time:
+            game.reducer.reset()
+            if self.incremental:
+                events = await game.connection.get_json("/liveclientdata/eventdata", {"eventID": 0})
+                if events is None:
+                    return False
+                live_data["events"] = events
+        game.game_time = game_time
+
+        with timed("reduce"):
+            state = game_from_live_data(live_data, game.reducer, game.platform_id, game.rank)
+        self._pending[game.name] = (state, live_data, time.time())
+        self._wake.set()
+        return True
+
+    async def _watch(self, game):
+        while True:
+            try:
+                ok = await asyncio.wait_for(self._poll(game), self.timeout)
+                game.last_error = None if ok else "no game data"
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                ok = False
+                game.last_error = f"timed out after {self.timeout:g}s"
+                game.connection.close()
+            except Exception as e:
+                ok = False
+                game.last_error = f"{type(e).__name__}: {e}"
+                game.connection.close()
+            game.polls += 1
+            if ok:
+                game.failures = 0
+                game.next_delay = self.interval
+            else:
+                game.failures += 1
+                game.next_delay = min(self.max_backoff, self.interval * (2 ** game.failures))
+            await asyncio.sleep(game.next_delay)
+
+    async def _score(self):
+        """Score every state that arrived since the last batch in one call."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            pending, self._pending = self._pending, {}
+            names = [name for name in pending if name in self.games]
+            if not names:
+                continue
+            states = [pending[name][0] for name in names]
+            try:
+                winners, proba = await loop.run_in_executor(None, self.predictor.predict_games, states)
+            except Exception as e:
+                error = f"scoring failed: {type(e).__name__}: {e}"
+                for name in names:
+                    if name in self.games:
+                        self.games[name].score_error = error
+                continue
+            self.batches += 1
+            for name, winner, row in zip(names, winners, proba):
+                # Endpoints removed while the batch was scored are skipped
+                game = self.games.get(name)
+                if game is None:
+                    continue
+                state, live_data, fetched_at = pending[name]
+                game.score_error = None
+                game.version += 1
+                game.latest = LiveUpdate(game.version, fetched_at, live_data, state, winner, row)
+                if self.on_update is not None:
+                    try:
+                        self.on_update(name, game.latest)
+                    except Exception:
+                        pass
+
+    async def run(self, endpoints=()):
+        """Watch ``endpoints`` until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        for spec in endpoints:
+            name, url = parse_endpoint(spec)
+            self.add_endpoint(url, name)
+        scorer = self._loop.create_task(self._score())
+        try:
+            await asyncio.Event().wait()
+        finally:
+            scorer.cancel()
+            for name in list(self.games):
+                self.remove_endpoint(name)
+
+    # === Background thread ===
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, endpoints=()):
+        """Run the monitor on a private event loop in one daemon thread."""
+        if self.is_running:
+            return
+        started = threading.Event()
+        loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            self._task = loop.create_task(self.run(endpoints))
+            loop.call_soon(started.set)
+            try:
+                loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                loop.run_until_complete(loop.shutdown_default_executor())
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="live-monitor", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self, timeout=5):
+        if self.is_running:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(timeout)
+        self._thread = None
+        self._loop = None
+
+
+def format_rows(rows):
+    """Plain-text dashboard table."""
+    lines = [f"{'game':<24} {'status':<12} {'time':>6} {'team 1':>7} {'team 2':>7}  note"]
+    for row in rows:
+        game_time = "-"
+        team_1 = team_2 = "-"
+        if row["game_time"] is not None:
+            game_time = f"{int(row['game_time'] // 60)}:{int(row['game_time'] % 60):02d}"
+            team_1, team_2 = f"{row['proba_100']:.0%}", f"{row['proba_200']:.0%}"
+        note = row["error"] or ""
+        if row["failures"]:
+            note = f"{row['error']}; retry in {row['retry_in_s']:.0f}s"
+        lines.append(f"{row['game'][:24]:<24} {row['status']:<12} {game_time:>6} {team_1:>7} {team_2:>7}  {note}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch several live games and print their win probabilities.")
+    parser.add_argument("endpoints", nargs="+", help="LiveClientData base URLs, optionally as name=url")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between polls of each endpoint")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Per-poll timeout of each endpoint")
+    parser.add_argument("--max-backoff", type=float, default=30.0)
+    parser.add_argument("--platform", default="NA1")
+    parser.add_argument("--rank", default="Gold")
+    parser.add_argument("--refresh", type=float, default=2.0, help="Seconds between dashboard refreshes")
+    args = parser.parse_args(argv)
+
+    from predictor import Predictor
+
+    monitor = LiveMonitor(Predictor(), args.interval, args.timeout, args.max_backoff, args.platform, args.rank)
+
+    async def dashboard():
+        task = asyncio.get_running_loop().create_task(monitor.run(args.endpoints))
+        try:
+            while True:
+                await asyncio.sleep(args.refresh)
+                print("\033[2J\033[H" + format_rows(monitor.rows()), flush=True)
+        finally:
+            task.cancel()
+
+    try:
+        asyncio.run(dashboard())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Local stand-in for the Riot LiveClientData API, serving synthetic games.
+
+Serves ``/liveclientdata/allgamedata``, ``eventdata?eventID=``,
+``playerlist``, ``gamestats``, ``activeplayer`` and ``activeplayername``
+over plain HTTP (or HTTPS with ``--certfile``/``--keyfile``) from a single
+asyncio loop, with keep-alive. The game clock runs ``--speed`` times faster
+than real time and ``--events-per-minute`` controls how event-heavy the
+game is.
+
+    python mock_live_server.py --port 2999 --speed 10 --events-per-minute 60
+    # then point LiveClient("http://127.0.0.1:2999") at it
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import random
+import ssl
+import time
+
+from async_http import run_in_thread, serve_http
+from champions import champion_list
+
+POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+DRAGON_TYPES = ["Fire", "Earth", "Water", "Air", "Hextech", "Chemtech"]
+# Objectives per game, as on the real map (and within the app's input ranges):
+# total and per-team caps; a team with four elemental dragons has its soul and
+# only Elders follow
+OBJECTIVE_LIMITS = {
+    "TurretKilled": (22, 11),
+    "BaronKill": (3, 2),
+    "VoidGrubKill": (6, 3),
+    "HeraldKill": (1, 1),
+    "DragonKill": (10, 5),
+}
+SOUL_DRAGONS = 4
+
+
+class SyntheticGame:
+    """A deterministic generated game whose state is read at a game time.
+
+    The whole event stream is drawn up front from ``seed``; player scores are
+    folded forward incrementally as the clock advances, so reading the state
+    costs O(new events). Objectives stay within ``OBJECTIVE_LIMITS`` and the
+    stream ends with a ``GameEnd`` event at ``duration``; the winning team
+    is ``winner``.
+    """
+
+    def __init__(self, seed=0, duration=40 * 60, events_per_minute=12, speed=1.0, start_at=0.0):
+        self.rng = random.Random(seed)
+        self.duration = duration
+        self.speed = speed
+        self.start_at = start_at
+        self.started = time.monotonic()
+
+        champs = self.rng.sample(champion_list, 10)
+        self.players = [
+            {
+                "summonerName": f"Summoner{i + 1}",
+                "riotIdGameName": f"Summoner{i + 1}",
+                "championName": champs[i],
+                "team": "ORDER" if i < 5 else "CHAOS",
+                "position": POSITIONS[i % 5],
+                "level": 1,
+                "isBot": False,
+                "isDead": False,
+                "items": [],
+                "scores": {"kills": 0, "deaths": 0, "assists": 0, "creepScore": 0, "wardScore": 0.0},
+            }
+            for i in range(10)
+        ]
+        self.active_player = self.players[0]["summonerName"]
+        self.events = self._generate_events(events_per_minute)
+        self.event_times = [e["EventTime"] for e in self.events]
+        self.applied = 0
+
+    # === Event generation ===
+
+    def _team_players(self, team):
+        return self.players[:5] if team == 100 else self.players[5:]
+
+    def _generate_events(self, events_per_minute):
+        rng = self.rng
+        events = [{"EventName": "GameStart", "EventTime": 0.0}]
+        for _ in range(int(events_per_minute * self.duration / 60)):
+            t = rng.uniform(60, self.duration)
+            team = rng.choice((100, 200))
+            killer = rng.choice(self._team_players(team))["summonerName"]
+            roll = rng.random()
+            if roll < 0.7:
+                victim = rng.choice(self._team_players(300 - team))["summonerName"]
+                assisters = [p["summonerName"] for p in rng.sample(self._team_players(team), 2)
+                             if p["summonerName"] != killer]
+                events.append({"EventName": "ChampionKill", "EventTime": t, "KillerName": killer,
+                               "VictimName": victim, "Assisters": assisters})
+            elif roll < 0.8:
+                events.append({"EventName": "TurretKilled", "EventTime": t, "KillerName": killer,
+                               "TurretKilled": f"Turret_T{1 if team == 200 else 2}_L1_P3", "Assisters": []})
+            elif roll < 0.87:
+                dragon = "Elder" if t > 35 * 60 else rng.choice(DRAGON_TYPES)
+                events.append({"EventName": "DragonKill", "EventTime": t, "KillerName": killer,
+                               "DragonType": dragon, "Stolen": "False", "Assisters": []})
+            elif roll < 0.93 and t < 14 * 60:
+                events.append({"EventName": "VoidGrubKill", "EventTime": t, "KillerName": killer, "Assisters": []})
+            elif roll < 0.96 and 14 * 60 <= t < 20 * 60:
+                events.append({"EventName": "HeraldKill", "EventTime": t, "KillerName": killer,
+                               "Stolen": "False", "Assisters": []})
+            elif t >= 20 * 60:
+                events.append({"EventName": "BaronKill", "EventTime": t, "KillerName": killer,
+                               "Stolen": "False", "Assisters": []})
+        events.sort(key=lambda e: e["EventTime"])
+        events = self._cap_objectives(events)
+        events.append({"EventName": "GameEnd", "EventTime": float(self.duration), "Result": None})
+        for event_id, e in enumerate(events):
+            e["EventID"] = event_id
+        self._set_result(events)
+        return events
+
+    def _cap_objectives(self, events):
+        """Drop objective events, in time order, past the per-game limits."""
+        team_of_name = {p["summonerName"]: 100 if p["team"] == "ORDER" else 200 for p in self.players}
+        totals = {name: 0 for name in OBJECTIVE_LIMITS}
+        per_team = {name: {100: 0, 200: 0} for name in OBJECTIVE_LIMITS}
+        elemental = {100: 0, 200: 0}
+        kept = []
+        for e in events:
+            name = e["EventName"]
+            if name in OBJECTIVE_LIMITS:
+                team = team_of_name[e["KillerName"]]
+                total_cap, team_cap = OBJECTIVE_LIMITS[name]
+                if totals[name] >= total_cap or per_team[name][team] >= team_cap:
+                    continue
+                if name == "DragonKill":
+                    soul = max(elemental.values()) >= SOUL_DRAGONS
+                    if e["DragonType"] == "Elder" and not soul:
+                        e["DragonType"] = self.rng.choice(DRAGON_TYPES)
+                    elif e["DragonType"] != "Elder" and soul:
+                        e["DragonType"] = "Elder"
+                    if e["DragonType"] != "Elder":
+                        elemental[team] += 1
+                totals[name] += 1
+                per_team[name][team] += 1
+            kept.append(e)
+        return kept
+
+    def _set_result(self, events):
+        """The side with more turrets (then kills) wins; ``Result`` is from the active player's view."""
+        team_of_name = {p["summonerName"]: 100 if p["team"] == "ORDER" else 200 for p in self.players}
+        score = {100: [0, 0], 200: [0, 0]}
+        for e in events:
+            if e["EventName"] in ("TurretKilled", "ChampionKill"):
+                score[team_of_name[e["KillerName"]]][e["EventName"] == "ChampionKill"] += 1
+        self.winner = 100 if score[100] >= score[200] else 200
+        active_team = 100 if self.players[0]["team"] == "ORDER" else 200
+        events[-1]["Result"] = "Win" if self.winner == active_team else "Lose"
+
+    # === State at the current game time ===
+
+    def game_time(self):
+        elapsed = (time.monotonic() - self.started) * self.speed
+        return min(self.duration, self.start_at + elapsed)
+
+    def _advance(self, game_time):
+        """Fold events up to ``game_time`` into the player scores."""
+        by_name = {p["summonerName"]: p for p in self.players}
+        visible = bisect.bisect_right(self.event_times, game_time)
+        for e in self.events[self.applied:visible]:
+            if e["EventName"] != "ChampionKill":
+                continue
+            by_name[e["KillerName"]]["scores"]["kills"] += 1
+            by_name[e["VictimName"]]["scores"]["deaths"] += 1
+            for name in e["Assisters"]:
+                by_name[name]["scores"]["assists"] += 1
+        self.applied = max(self.applied, visible)
+
+        minutes = game_time / 60
+        for i, p in enumerate(self.players):
+            p["scores"]["creepScore"] = int(minutes * (2 if p["position"] in ("JUNGLE", "UTILITY") else 7))
+            p["level"] = min(18, 1 + int(minutes / 1.8) + (i % 2))
+        return visible
+
+    def snapshot(self):
+        game_time = self.game_time()
+        visible = self._advance(game_time)
+        return game_time, visible
+
+    def game_stats(self, game_time):
+        return {"gameMode": "CLASSIC", "gameTime": game_time, "mapName": "Map11",
+                "mapNumber": 11, "mapTerrain": "Default"}
+
+    def active_player_data(self):
+        p = self.players[0]
+        return {"summonerName": p["summonerName"], "level": p["level"],
+                "championStats": {"level": p["level"]}, "currentGold": 0.0}
+
+    def route(self, path, query):
+        """Return the JSON document for a LiveClientData path, or None."""
+        game_time, visible = self.snapshot()
+        if path == "/liveclientdata/allgamedata":
+            return {
+                "activePlayer": self.active_player_data(),
+                "allPlayers": self.players,
+                "events": {"Events": self.events[:visible]},
+                "gameData": self.game_stats(game_time),
+            }
+        if path == "/liveclientdata/eventdata":
+            start = int(query.get("eventID", ["0"])[0])
+            return {"Events": self.events[max(0, start):visible]}
+        if path == "/liveclientdata/playerlist":
+            return self.players
+        if path == "/liveclientdata/gamestats":
+            return self.game_stats(game_time)
+        if path == "/liveclientdata/activeplayer":
+            return self.active_player_data()
+        if path == "/liveclientdata/activeplayername":
+            # A JSON string, as the real client sends it (a str would go out as plain text)
+            return json.dumps(self.active_player).encode()
+        return None
+
+
+# === HTTP server ===
+
+def make_handler(game):
+    async def handler(method, path, query, body):
+        document = game.route(path, query)
+        if document is None:
+            return "404 Not Found", {"errorCode": "RESOURCE_NOT_FOUND"}
+        return "200 OK", document
+    return handler
+
+
+async def serve(game, host="127.0.0.1", port=2999, ssl_context=None, ready=None):
+    await serve_http(make_handler(game), host, port, ssl_context, ready)
+
+
+def serve_in_thread(game, host="127.0.0.1", port=0):
+    """Run the mock server on a daemon thread; return (base_url, stop)."""
+    return run_in_thread(lambda ready: serve(game, host, port, ready=ready), host, "mock-live-server")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a synthetic game on the LiveClientData endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2999)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--speed", type=float, default=1.0, help="Game seconds per real second")
+    parser.add_argument("--duration", type=float, default=40, help="Game length in minutes")
+    parser.add_argument("--start-at", type=float, default=0, help="Start the clock at this game minute")
+    parser.add_argument("--events-per-minute", type=float, default=12)
+    parser.add_argument("--certfile", help="Serve HTTPS with this certificate, like the real client")
+    parser.add_argument("--keyfile")
+    args = parser.parse_args(argv)
+
+    game = SyntheticGame(args.seed, args.duration * 60, args.events_per_minute, args.speed, args.start_at * 60)
+    ssl_context = None
+    if args.certfile:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(args.certfile, args.keyfile)
+
+    scheme = "https" if ssl_context else "http"
+    print(f"Serving {len(game.events)} events at {scheme}://{args.host}:{args.port}/liveclientdata/")
+    try:
+        asyncio.run(serve(game, args.host, args.port, ssl_context))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Dependency-free NumPy scorer for the deployed logistic model.
+
+``python numpy_model.py`` exports ``logistic_model_deployed.joblib`` (a
+``LogisticRegression``, optionally behind per-feature scalers in a
+``Pipeline``) to ``logistic_model_deployed.npz``: coefficients, intercept,
+classes and feature order, with any scaling folded into the coefficients.
+``NumpyModel`` scores that artifact with one dot product plus a sigmoid and
+gives the same probabilities as ``predict_proba`` without importing
+scikit-learn or joblib (up to floating-point rounding of the sigmoid).
+"""
+import hashlib
+import os
+from collections import namedtuple
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_MODEL_PATH = os.path.join(BASE_DIR, "logistic_model_deployed.joblib")
+NUMPY_MODEL_PATH = os.path.join(BASE_DIR, "logistic_model_deployed.npz")
+FEATURE_COLUMNS_PATH = os.path.join(BASE_DIR, "feature_columns.pkl")
+MODEL_VERSION_PATH = os.path.join(BASE_DIR, "model_version.json")
+
+# train.py writes each deployment to its own directory here and then
+# switches CURRENT, a one-line pointer, to it with a single rename
+DEPLOYMENTS_DIR = os.path.join(BASE_DIR, "deployments")
+CURRENT_DEPLOYMENT = "CURRENT"
+
+Deployment = namedtuple("Deployment", ["model_path", "numpy_path", "feature_columns_path", "version_path"])
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def artifact_paths(directory=BASE_DIR):
+    """The artifact files of one deployment directory."""
+    return Deployment(*(
+        os.path.join(directory, os.path.basename(p))
+        for p in (SOURCE_MODEL_PATH, NUMPY_MODEL_PATH, FEATURE_COLUMNS_PATH, MODEL_VERSION_PATH)
+    ))
+
+
+def current_deployment(deployments_dir=DEPLOYMENTS_DIR):
+    """Artifacts of the deployment named by ``CURRENT``, or the ones next to the app."""
+    try:
+        with open(os.path.join(deployments_dir, CURRENT_DEPLOYMENT)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return artifact_paths()
+    return artifact_paths(os.path.join(deployments_dir, name))
+
+
+class NumpyModel:
+    """Binary logistic regression scored with NumPy only.
+
+    Exposes the parts of the scikit-learn estimator API the app uses:
+    ``classes_``, ``coef_``, ``intercept_``, ``decision_function`` and
+    ``predict_proba``.
+    """
+
+    def __init__(self, coef, intercept, classes, feature_columns, source_sha256=""):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).reshape(-1)
+        self.intercept = float(intercept)
+        self.classes_ = np.asarray(classes)
+        self.feature_columns = [str(c) for c in feature_columns]
+        self.source_sha256 = source_sha256
+
+    @property
+    def coef_(self):
+        return self.coef.reshape(1, -1)
+
+    @property
+    def intercept_(self):
+        return np.array([self.intercept])
+
+    @property
+    def n_features_in_(self):
+        return self.coef.shape[0]
+
+    def decision_function(self, X):
+        # Same (n, k) @ (k, 1) product as scikit-learn, for identical rounding
+        return (np.asarray(X, dtype=np.float64) @ self.coef_.T).reshape(-1) + self.intercept
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack((1.0 - p, p))
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(np.intp)]
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            coef=self.coef,
+            intercept=np.array(self.intercept),
+            classes=self.classes_,
+            feature_columns=np.array(self.feature_columns),
+            source_sha256=np.array(self.source_sha256),
+        )
+
+    @classmethod
+    def from_estimator(cls, model, feature_columns, source_sha256=""):
+        """Export a fitted binary linear classifier, optionally behind scalers in a ``Pipeline``."""
+        steps = [step for _, step in model.steps] if hasattr(model, "steps") else [model]
+        estimator = steps[-1]
+        if estimator.coef_.shape[0] != 1 or len(estimator.classes_) != 2:
+            raise ValueError("Only binary logistic models can be exported")
+
+        coef = estimator.coef_[0].astype(np.float64)
+        intercept = float(estimator.intercept_[0])
+        for step in reversed(steps[:-1]):
+            if step == "passthrough" or step is None:
+                continue
+            coef, intercept = fold_scaler(step, coef, intercept)
+
+        if len(coef) != len(feature_columns):
+            raise ValueError(f"Model has {len(coef)} coefficients but the schema has {len(feature_columns)} columns")
+        return cls(coef, intercept, estimator.classes_, feature_columns, source_sha256)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["coef"],
+                data["intercept"],
+                data["classes"],
+                data["feature_columns"].tolist(),
+                str(data["source_sha256"]),
+            )
+
+
+def fold_scaler(step, coef, intercept):
+    """Fold a per-feature affine scaler into the downstream coefficients."""
+    name = type(step).__name__
+    if name == "StandardScaler":
+        mean = step.mean_ if step.with_mean else 0.0
+        scale = step.scale_ if step.with_std else 1.0
+        return coef / scale, intercept - np.sum(coef * mean / scale)
+    if name == "MinMaxScaler":
+        return coef * step.scale_, intercept + np.sum(coef * step.min_)
+    if name == "MaxAbsScaler":
+        return coef / step.scale_, intercept
+    raise ValueError(f"Cannot export pipeline step {name}; only per-feature scalers are supported")
+
+
+def export(model_path=SOURCE_MODEL_PATH, feature_columns_path=FEATURE_COLUMNS_PATH, out_path=NUMPY_MODEL_PATH):
+    """Convert the joblib model into a ``NumpyModel`` artifact."""
+    import joblib
+
+    model = joblib.load(model_path)
+    feature_columns = list(joblib.load(feature_columns_path))
+    exported = NumpyModel.from_estimator(model, feature_columns, file_sha256(model_path))
+    exported.save(out_path)
+    return exported, model
+
+
+if __name__ == "__main__":
+    exported, model = export()
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 30, size=(1000, exported.n_features_in_)).astype(np.float64)
+    diff = np.abs(exported.predict_proba(X) - model.predict_proba(X)).max()
+    print(f"Wrote {NUMPY_MODEL_PATH} ({os.path.getsize(NUMPY_MODEL_PATH)} bytes), max |dp| = {diff:.3g}")
@@ -0,0 +1,260 @@
+"""Standalone HTTP prediction API with request micro-batching.
+
+Endpoints:
+
+* ``POST /predict`` -- a snapshot (see ``predictor``) or a list of them;
+  returns ``{"winner", "proba": {"100", "200"}}`` per snapshot.
+* ``POST /what-if`` -- one snapshot; returns its probabilities, the default
+  counterfactual scenarios scored in the same batch, and per-feature logit
+  contributions (empty, with ``contributions_error`` set, for a model that
+  is not linear).
+* ``GET /metrics`` -- request/batch counters, queue depth, latency
+  percentiles, per-stage timings (see ``latency``) and prediction cache
+  counters.
+* ``GET /metrics/prometheus`` -- per-stage timings in the Prometheus text
+  format.
+* ``GET /health``
+
+Concurrent requests are gathered for up to ``--max-wait-ms`` (or until
+``--max-batch`` snapshots) and scored with one ``predict_proba`` call on a
+worker thread, so the event loop keeps accepting requests meanwhile.
+
+    python prediction_api.py --port 8600
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from async_http import run_in_thread, serve_http
+from latency import stage_timings
+from what_if import build_scenarios, feature_contributions, scenario_results
+
+LATENCY_PERCENTILES = [50, 95, 99]
+
+
+class MicroBatcher:
+    """Collects queued snapshot lists into batches of one ``predict_proba`` call."""
+
+    def __init__(self, predictor, max_batch=512, max_wait=0.002, latency_window=10000):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict")
+
+        self.requests = 0
+        self.snapshots = 0
+        self.batches = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.batch_sizes = deque(maxlen=latency_window)
+
+    async def predict(self, snapshots):
+        """Queue snapshots and wait for their (winners, proba)."""
+        future = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        self.requests += 1
+        await self.queue.put((snapshots, future))
+        try:
+            return await future
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        size = len(batch[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch:
+            if self.queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self.queue.get_nowait()
+            batch.append(item)
+            size += len(item[0])
+        return batch, size
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, size = await self._collect()
+            rows = [snapshot for snapshots, _ in batch for snapshot in snapshots]
+            self.in_flight = size
+            try:
+                winners, proba = await loop.run_in_executor(self.executor, self.predictor.predict, rows)
+            except Exception:
+                # Score requests one by one so a malformed snapshot only fails its own request
+                for snapshots, future in batch:
+                    try:
+                        result = await loop.run_in_executor(self.executor, self.predictor.predict, snapshots)
+                    except Exception as e:
+                        self.errors += 1
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+                continue
+            finally:
+                self.in_flight = 0
+
+            self.batches += 1
+            self.snapshots += size
+            self.batch_sizes.append(size)
+            start = 0
+            for snapshots, future in batch:
+                end = start + len(snapshots)
+                if not future.done():
+                    future.set_result((winners[start:end], proba[start:end]))
+                start = end
+
+    def metrics(self):
+        latencies_ms = np.fromiter(self.latencies, dtype=np.float64) * 1000
+        metrics = {
+            "requests": self.requests,
+            "snapshots": self.snapshots,
+            "batches": self.batches,
+            "errors": self.errors,
+            "queue_depth": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "mean_batch_size": float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0,
+        }
+        for p in LATENCY_PERCENTILES:
+            metrics[f"latency_p{p}_ms"] = float(np.percentile(latencies_ms, p)) if len(latencies_ms) else 0.0
+        metrics["stages"] = stage_timings.summary()
+        if self.predictor.cache is not None:
+            metrics["cache"] = self.predictor.cache.stats()
+        return metrics
+
+
+def proba_by_team(classes, row):
+    return {str(int(c)): float(p) for c, p in zip(classes, row)}
+
+
+def format_predictions(classes, winners, proba):
+    return [{"winner": int(w), "proba": proba_by_team(classes, row)} for w, row in zip(winners, proba)]
+
+
+async def what_if(batcher, snapshot):
+    batch, feasible = build_scenarios(snapshot)
+    _, proba = await batcher.predict(batch)
+    classes = batcher.predictor.model.classes_
+    base, results = scenario_results(feasible, proba)
+    try:
+        intercept, contributions = feature_contributions(batcher.predictor, snapshot)
+        contributions_error = None
+    except ValueError as e:
+        intercept, contributions, contributions_error = None, [], str(e)
+    return {
+        "proba": proba_by_team(classes, base),
+        "scenarios": [
+            {"label": r["label"], "deltas": r["deltas"],
+             "proba": proba_by_team(classes, r["proba"]), "change": proba_by_team(classes, r["change"])}
+            for r in results
+        ],
+        "intercept": intercept,
+        "contributions": [
+            {"feature": name, "value": value, "coefficient": coef, "contribution": term}
+            for name, value, coef, term in contributions
+        ],
+        "contributions_error": contributions_error,
+    }
+
+
+def make_handler(batcher, classes):
+    async def handler(method, path, query, body):
+        if path == "/health":
+            return "200 OK", {"status": "ok"}
+        if path == "/metrics":
+            return "200 OK", batcher.metrics()
+        if path == "/metrics/prometheus":
+            return "200 OK", stage_timings.to_prometheus()
+        if path not in ("/predict", "/what-if"):
+            return "404 Not Found", {"error": "not found"}
+        if method != "POST":
+            return "405 Method Not Allowed", {"error": "use POST"}
+
+        try:
+            document = json.loads(body or b"null")
+        except ValueError:
+            return "400 Bad Request", {"error": "body is not valid JSON"}
+
+        if path == "/what-if":
+            if not isinstance(document, dict):
+                return "400 Bad Request", {"error": "expected a snapshot object"}
+            try:
+                batcher.predictor.encoder.check_snapshot(document)
+            except ValueError as e:
+                return "400 Bad Request", {"error": str(e)}
+            try:
+                return "200 OK", await what_if(batcher, document)
+            except Exception as e:
+                return "500 Internal Server Error", {"error": str(e)}
+
+        snapshots = document if isinstance(document, list) else [document]
+        if not snapshots or not all(isinstance(s, dict) for s in snapshots):
+            return "400 Bad Request", {"error": "expected a snapshot object or a list of them"}
+        # Rejected here, so a bad snapshot cannot fail the batch it would share with other requests
+        try:
+            for i, snapshot in enumerate(snapshots):
+                batcher.predictor.encoder.check_snapshot(snapshot)
+        except ValueError as e:
+            where = f"snapshot {i}: " if isinstance(document, list) else ""
+            return "400 Bad Request", {"error": f"{where}{e}"}
+
+        try:
+            winners, proba = await batcher.predict(snapshots)
+        except Exception as e:
+            return "500 Internal Server Error", {"error": str(e)}
+        predictions = format_predictions(classes, winners, proba)
+        return "200 OK", predictions if isinstance(document, list) else predictions[0]
+    return handler
+
+
+async def serve(predictor, host="127.0.0.1", port=8600, max_batch=512, max_wait=0.002, ready=None):
+    batcher = MicroBatcher(predictor, max_batch, max_wait)
+    worker = asyncio.create_task(batcher.run())
+    try:
+        await serve_http(make_handler(batcher, predictor.model.classes_), host, port, ready=ready)
+    finally:
+        worker.cancel()
+        batcher.executor.shutdown(wait=False)
+
+
+def serve_in_thread(predictor, host="127.0.0.1", port=0, **kwargs):
+    """Run the API on a daemon thread; return (base_url, stop)."""
+    return run_in_thread(lambda ready: serve(predictor, host, port, ready=ready, **kwargs), host, "prediction-api")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve win predictions over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--max-batch", type=int, default=512, help="Most snapshots scored per model call")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="How long a batch waits to fill up")
+    parser.add_argument("--cache-size", type=int, default=0, help="Memoize this many predictions (0: off)")
+    args = parser.parse_args(argv)
+
+    from predictor import Predictor
+
+    print(f"Serving predictions at http://{args.host}:{args.port}/predict")
+    try:
+        asyncio.run(serve(Predictor(cache_size=args.cache_size), args.host, args.port, args.max_batch, args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Headless batch prediction engine for the mid-game win predictor.
+
+A snapshot is a flat dict with the same raw fields the Predict button
+assembles: ``kills_p1`` .. ``level_p10``, ``champion_p1`` .. ``champion_p10``,
+the objective counters, ``snapshot_time_sec``, ``platform_id`` and ``rank``.
+Missing numeric fields default to 0, as ``reindex(fill_value=0)`` did.
+"""
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+
+from feature_encoder import FEATURE_COLUMNS_PATH, get_encoder
+from game_state import GameStateLayout
+from latency import timed
+from numpy_model import SOURCE_MODEL_PATH, NumpyModel, current_deployment, file_sha256
+
+MODEL_PATH = SOURCE_MODEL_PATH
+
+
+def load_model(model_path=None, deployment=None):
+    """Load the exported NumPy model, or the joblib model as a fallback.
+
+    By default the current deployment's ``.npz`` export is used unless it
+    is missing or was exported from a different ``.joblib`` than the one
+    next to it; only the fallback imports joblib and scikit-learn.
+    """
+    if model_path is None:
+        deployment = deployment or current_deployment()
+        if os.path.exists(deployment.numpy_path):
+            exported = NumpyModel.load(deployment.numpy_path)
+            source_path = deployment.model_path
+            if not os.path.exists(source_path) or exported.source_sha256 == file_sha256(source_path):
+                return exported
+            warnings.warn(f"{deployment.numpy_path} is stale; re-run numpy_model.py. Using {source_path}.")
+        model_path = deployment.model_path
+
+    if model_path.endswith(".npz"):
+        return NumpyModel.load(model_path)
+    import joblib
+    return joblib.load(model_path)
+
+
+def load_model_version(deployment=None):
+    """Read a deployment's version stamp and check it against its artifacts.
+
+    Raises ValueError if the model or schema on disk is not the one the
+    stamp was written for (e.g. a hand-edited deployment). Returns None
+    when there is no stamp.
+    """
+    deployment = deployment or current_deployment()
+    version_path = deployment.version_path
+    if not os.path.exists(version_path):
+        return None
+    with open(version_path) as f:
+        stamp = json.load(f)
+    checks = (("model_sha256", deployment.model_path), ("feature_columns_sha256", deployment.feature_columns_path))
+    for key, path in checks:
+        if os.path.exists(path) and stamp.get(key) != file_sha256(path):
+            raise ValueError(f"{path} does not match {version_path}; the deployed artifacts are out of sync")
+    return stamp
+
+
+class PredictionCache:
+    """Bounded LRU of probability rows keyed by (model version, feature-vector digest).
+
+    Snapshots between live events usually encode to the same vector, so
+    reruns and polls mostly hit. Safe to share between threads. ``Predictor``
+    also keeps its per-game static logit terms in one.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(row):
+        return hashlib.blake2b(row.tobytes(), digest_size=16).digest()
+
+    def lookup(self, keys):
+        """Cached rows for ``keys`` (None for misses), counting hits and misses."""
+        rows = []
+        with self._lock:
+            for key in keys:
+                row = self._entries.get(key)
+                if row is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                rows.append(row)
+        return rows
+
+    def store(self, keys, rows):
+        with self._lock:
+            for key, row in zip(keys, rows):
+                self._entries[key] = row
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def linear_model_of(model, feature_columns):
+    """``model`` as a ``NumpyModel`` (raw-feature coefficients), or None if it is not linear."""
+    if isinstance(model, NumpyModel):
+        return model
+    try:
+        return NumpyModel.from_estimator(model, feature_columns)
+    except (AttributeError, ValueError):
+        return None
+
+
+class Predictor:
+    """Scores batches of snapshots with one ``predict_proba`` call.
+
+    With ``cache_size`` > 0, probabilities are memoized per encoded feature
+    vector in a ``PredictionCache`` and only the misses reach the model.
+
+    For a logistic model, ``predict_games`` splits the logit: the lineup,
+    platform and rank columns add a term that is fixed for a whole game,
+    cached per (lineup, platform, rank) for ``static_cache_size`` games, so
+    each poll only evaluates the stat, objective and time columns.
+    """
+
+    def __init__(self, model_path=None, feature_columns_path=FEATURE_COLUMNS_PATH, cache_size=0,
+                 static_cache_size=256):
+        stamp = deployment = None
+        if model_path is None and feature_columns_path == FEATURE_COLUMNS_PATH:
+            # Resolved once, so the model, schema and stamp all come from the same deployment
+            deployment = current_deployment()
+            stamp = load_model_version(deployment)
+            feature_columns_path = deployment.feature_columns_path
+        self.model_version = stamp["version"] if stamp else "unversioned"
+        self.model = load_model(model_path, deployment)
+        self.cache = PredictionCache(cache_size) if cache_size > 0 else None
+        # Unstamped models get a per-instance key so a shared cache cannot mix them up
+        self.cache_version = self.model_version if stamp else f"unversioned-{id(self.model):x}"
+        self.encoder = get_encoder(feature_columns_path)
+        self.game_layout = GameStateLayout(self.encoder)
+        self.feature_columns = self.encoder.feature_columns
+
+        model_columns = getattr(self.model, "feature_columns", None)
+        if model_columns is None:
+            model_columns = getattr(self.model, "feature_names_in_", None)
+        if model_columns is not None and list(model_columns) != self.feature_columns:
+            raise ValueError("Model feature order does not match the feature schema")
+
+        self.linear_model = linear_model_of(self.model, self.feature_columns)
+        self.static_terms = None
+        if self.linear_model is not None and static_cache_size > 0:
+            self.static_terms = PredictionCache(static_cache_size)
+            self.dynamic_coef = self.linear_model.coef[self.game_layout.dynamic_columns]
+
+    @property
+    def n_features(self):
+        return self.encoder.n_features
+
+    def encode(self, snapshots, out=None):
+        """Encode snapshots; return (X, names of inputs that map to no column)."""
+        with timed("encode"):
+            return self.encoder.encode_batch(snapshots, out=out)
+
+    def encode_games(self, games, out=None):
+        """Encode ``GameState`` objects; return (X, unmapped names) like ``encode``."""
+        with timed("encode"):
+            return self.game_layout.encode(games, out=out)
+
+    def build_matrix(self, snapshots, out=None):
+        """Encode snapshots into an (n, n_features) float array.
+
+        See ``FeatureEncoder.encode_batch`` for the lifetime of the result.
+        """
+        return self.encode(snapshots, out=out)[0]
+
+    def predict_proba_matrix(self, X):
+        """Run the model (or the cache) on an already encoded matrix."""
+        if self.cache is None:
+            return self._predict_proba(X)
+        if len(X) == 0:
+            return np.empty((0, len(self.model.classes_)))
+
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        keys = [(self.cache_version, PredictionCache.digest(row)) for row in X]
+        rows = self.cache.lookup(keys)
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            fresh = self._predict_proba(X[missing])
+            # Copies, so a cached row does not keep the whole batch alive
+            fresh_rows = [row.copy() for row in fresh]
+            self.cache.store([keys[i] for i in missing], fresh_rows)
+            for i, row in zip(missing, fresh_rows):
+                rows[i] = row
+        return np.vstack(rows)
+
+    def _predict_proba(self, X):
+        with timed("inference"), warnings.catch_warnings():
+            # The model was fitted on a DataFrame; the column order is the same.
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            return self.model.predict_proba(X)
+
+    def predict(self, snapshots):
+        """Return (winners, probabilities) for a batch of snapshots.
+
+        Winners are team ids (100 or 200); probabilities have one column per
+        team in ``model.classes_`` order.
+        """
+        return self.predict_matrix(self.build_matrix(snapshots))
+
+    def predict_matrix(self, X):
+        """Return (winners, probabilities) for an already encoded matrix.
+
+        Winners are derived from the probabilities, so this is one model call.
+        """
+        proba = self.predict_proba_matrix(X)
+        winners = self.model.classes_[proba.argmax(axis=1)]
+        return winners, proba
+
+    def predict_games(self, games):
+        """Return (winners, probabilities) for a batch of ``GameState`` objects.
+
+        Linear models take the static/dynamic split (see the class docstring)
+        and bypass the ``PredictionCache``; the result matches a full
+        evaluation up to floating-point rounding.
+        """
+        if self.static_terms is None:
+            return self.predict_matrix(self.encode_games(games)[0])
+
+        with timed("encode"):
+            D = self.game_layout.encode_dynamic(games)
+            static = self.static_logits(games)
+        with timed("inference"):
+            p = 1.0 / (1.0 + np.exp(-(D @ self.dynamic_coef + static + self.linear_model.intercept)))
+            proba = np.column_stack((1.0 - p, p))
+        winners = self.linear_model.classes_[proba.argmax(axis=1)]
+        return winners, proba
+
+    def static_logits(self, games):
+        """Per-game logit term of the lineup, platform and rank columns, cached per game."""
+        keys = [(tuple(game.champions), game.platform_id, game.rank) for game in games]
+        terms = self.static_terms.lookup(keys)
+        missing = [i for i, term in enumerate(terms) if term is None]
+        if missing:
+            X = np.zeros((len(missing), self.n_features))
+            self.game_layout.encode_static([games[i] for i in missing], X)
+            fresh = list(X @ self.linear_model.coef)
+            self.static_terms.store([keys[i] for i in missing], fresh)
+            for i, term in zip(missing, fresh):
+                terms[i] = term
+        return np.array(terms, dtype=np.float64)
+
+    def predict_one(self, snapshot):
+        winners, proba = self.predict([snapshot])
+        return winners[0], proba[0]
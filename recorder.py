@@ -0,0 +1,192 @@
+"""Append-only, compressed recording of LiveClientData polls.
+
+Each record is one JSON line ``{"ts", "game_id", "data"}``. Lines are
+buffered into chunks and every chunk is appended to the current file as its
+own gzip member, so files are valid ``.jsonl.gz`` at every chunk boundary
+and readable with ``gzip.open``. Files rotate once they exceed
+``max_file_bytes``.
+
+Payloads from an incremental ``LivePoller`` carry only the events that were
+new at that poll, so a game must be replayed through one ``EventReducer``.
+Whenever earlier events may be missing from the file -- a payload could not
+be queued, recording was (re)started with ``mark_gap``, or the first payload
+of a game does not start at EventID 0 -- the next record is preceded by a
+gap marker ``{"ts", "game_id", "gap": true}`` and ``on_gap`` asks the poller
+to refetch the full event list. Replay skips states after a gap, and at the
+start of a game, until a payload whose events start at EventID 0.
+"""
+import glob
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RECORDINGS_DIR = os.path.join(BASE_DIR, "recordings")
+
+
+def has_full_events(live_data):
+    """Whether the payload's events start at the first event of the game."""
+    events = live_data.get("events", {}).get("Events", [])
+    return bool(events) and events[0].get("EventID", 0) == 0
+
+
+def game_id_of(live_data):
+    """Stable id for a game derived from its summoner/champion lineup."""
+    lineup = sorted(
+        f"{p.get('summonerName')}:{p.get('championName')}" for p in live_data.get("allPlayers", [])
+    )
+    return hashlib.blake2b("|".join(lineup).encode(), digest_size=6).hexdigest()
+
+
+class GameRecorder:
+    """Background writer for polled payloads.
+
+    ``record`` only queues a reference to the payload; serialization,
+    hashing, deduplication, compression and file IO happen on the writer
+    thread. A payload identical to the previous one of the same game is
+    skipped. When the queue is full the caller blocks for up to
+    ``put_timeout`` seconds; a payload that still does not fit is dropped,
+    counted, and turned into a gap marker plus an ``on_gap()`` call; the
+    same happens for the first payload of a game that lacks its earlier
+    events. ``on_gap`` may run on the writer thread.
+    """
+
+    def __init__(self, directory=RECORDINGS_DIR, max_file_bytes=64 * 1024 * 1024,
+                 chunk_records=64, flush_interval=5.0, queue_size=1024, put_timeout=1.0, on_gap=None):
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.chunk_records = chunk_records
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.on_gap = on_gap
+
+        self.recorded = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.path = None
+
+        self._gap = False
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._last_digest = {}
+        self._seen_games = set()
+        self._chunk = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="game-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, live_data, fetched_at=None):
+        """Queue one payload for writing; blocks for at most ``put_timeout`` seconds.
+
+        The payload must not be mutated afterwards; it is serialized later.
+        """
+        if self._closed or live_data is None:
+            return False
+        item = (time.time() if fetched_at is None else fetched_at, live_data, self._gap)
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+            self._gap = True
+            if self.on_gap is not None:
+                self.on_gap()
+            return False
+        self._gap = False
+        return True
+
+    def mark_gap(self):
+        """Earlier payloads were not recorded (e.g. recording was just turned on)."""
+        self._gap = True
+        if self.on_gap is not None:
+            self.on_gap()
+
+    def record_update(self, update):
+        """``LivePoller.on_update`` hook."""
+        self.record(update.live_data, update.fetched_at)
+
+    def close(self, timeout=None):
+        """Flush pending records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _new_path(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        n = 1
+        while True:
+            path = os.path.join(self.directory, f"live-{stamp}-{n:03d}.jsonl.gz")
+            if not os.path.exists(path):
+                return path
+            n += 1
+
+    def _is_duplicate(self, game_id, data):
+        digest = hashlib.blake2b(data.encode(), digest_size=16).digest()
+        if self._last_digest.get(game_id) == digest:
+            return True
+        if len(self._last_digest) > 64:
+            self._last_digest.clear()
+        self._last_digest[game_id] = digest
+        return False
+
+    def _flush(self):
+        if not self._chunk:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self.path is None or (os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_file_bytes):
+            self.path = self._new_path()
+        data = gzip.compress(("\n".join(self._chunk) + "\n").encode())
+        with open(self.path, "ab") as f:
+            f.write(data)
+        self.recorded += len(self._chunk)
+        self._chunk = []
+
+    def _run(self):
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = ()
+            if item is None:
+                self._flush()
+                return
+            if item:
+                ts, live_data, gap = item
+                game_id = game_id_of(live_data)
+                data = json.dumps(live_data, separators=(",", ":"))
+                if game_id not in self._seen_games:
+                    self._seen_games.add(game_id)
+                    if not gap and not has_full_events(live_data):
+                        gap = True
+                        if self.on_gap is not None:
+                            self.on_gap()
+                if gap:
+                    self._chunk.append(f'{{"ts":{ts!r},"game_id":"{game_id}","gap":true}}')
+                if not gap and self._is_duplicate(game_id, data):
+                    self.deduplicated += 1
+                else:
+                    self._chunk.append(f'{{"ts":{ts!r},"game_id":"{game_id}","data":{data}}}')
+            if len(self._chunk) >= self.chunk_records or time.monotonic() >= deadline:
+                self._flush()
+                deadline = time.monotonic() + self.flush_interval
+
+
+def iter_recording(paths):
+    """Yield records from recording files (or glob patterns) in order.
+
+    Plain ``.jsonl`` files in the same record format are read as well.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
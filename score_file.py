@@ -0,0 +1,206 @@
+"""Bulk offline scoring of snapshot files.
+
+Input rows carry the raw snapshot fields the predictor takes (see
+``predictor``), as CSV columns or JSONL objects. They are encoded with the
+same ``FeatureEncoder`` as the app's Predict button, so ``platform_id`` and
+``rank`` become the same one-hot columns and champions the same class and
+subclass counts.
+
+The input is read in chunks of ``--chunk-size`` rows and the chunks are
+scored on a process pool. Only a bounded number of chunks is in flight,
+and results are written in input order as they complete, so memory does
+not grow with the file size.
+
+    python score_file.py snapshots.csv scores.csv --workers 8
+    python score_file.py snapshots.jsonl.gz scores.jsonl --id-column match_id
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from feature_encoder import CATEGORICAL_FIELDS
+
+_predictor = None
+
+
+def _init_worker():
+    global _predictor
+    from predictor import Predictor
+    _predictor = Predictor()
+
+
+def file_format(path):
+    """"csv" or "jsonl" from the file name (a trailing .gz is allowed)."""
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of {path}; use .csv or .jsonl")
+
+
+def open_text(path, mode):
+    if path == "-":
+        return nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def iter_chunks(f, fmt, chunk_size):
+    """Yield (header, raw rows) chunks; header is None for JSONL.
+
+    CSV rows are lists of strings, JSONL rows undecoded lines, so parsing is
+    left to the workers.
+    """
+    if fmt == "csv":
+        reader = csv.reader(f)
+        header = next(reader, None)
+        rows = reader
+    else:
+        header = None
+        rows = (line for line in f if line.strip())
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield header, chunk
+            chunk = []
+    if chunk:
+        yield header, chunk
+
+
+def parse_csv_row(header, row, numeric_fields):
+    """Snapshot from one CSV row; empty cells count as missing."""
+    snapshot = {}
+    for name, value in zip(header, row):
+        if value == "":
+            continue
+        snapshot[name] = float(value) if name in numeric_fields else value
+    return snapshot
+
+
+def parse_rows(header, rows, numeric_fields):
+    if header is None:
+        return [json.loads(line) for line in rows]
+    return [parse_csv_row(header, row, numeric_fields) for row in rows]
+
+
+def score_chunk(first_row, header, rows, platform_id="NA1", rank="Gold", id_column=None, predictor=None):
+    """Parse and score one chunk.
+
+    Returns (ids, winners, proba, classes, unmapped input names); ids are
+    the ``id_column`` values, or row numbers counted from the first data row.
+    """
+    predictor = predictor or _predictor
+    numeric_fields = set(predictor.encoder.numeric_fields)
+    try:
+        snapshots = parse_rows(header, rows, numeric_fields)
+    except ValueError as e:
+        raise ValueError(f"Bad row in chunk starting at row {first_row}: {e}") from None
+
+    defaults = {"platform_id": platform_id, "rank": rank}
+    for snapshot in snapshots:
+        for field in CATEGORICAL_FIELDS:
+            if snapshot.get(field) in (None, ""):
+                snapshot[field] = defaults[field]
+
+    if id_column is None:
+        ids = list(range(first_row, first_row + len(snapshots)))
+    else:
+        ids = [snapshot.pop(id_column, None) for snapshot in snapshots]
+
+    X, unmapped = predictor.encode(snapshots)
+    winners, proba = predictor.predict_matrix(X)
+    return ids, winners.tolist(), proba, [int(c) for c in predictor.model.classes_], unmapped
+
+
+class ResultWriter:
+    """Writes scored chunks as CSV or JSONL rows of id, winner and proba per team."""
+
+    def __init__(self, f, fmt, id_name):
+        self.f = f
+        self.fmt = fmt
+        self.id_name = id_name
+        self.csv = csv.writer(f) if fmt == "csv" else None
+        self.rows = 0
+
+    def write(self, ids, winners, proba, classes):
+        columns = [f"proba_{c}" for c in classes]
+        if self.csv is not None:
+            if self.rows == 0:
+                self.csv.writerow([self.id_name, "winner"] + columns)
+            self.csv.writerows(
+                [row_id, int(winner)] + [f"{p:.6f}" for p in row]
+                for row_id, winner, row in zip(ids, winners, proba)
+            )
+        else:
+            for row_id, winner, row in zip(ids, winners, proba):
+                document = {self.id_name: row_id, "winner": int(winner)}
+                document.update((column, float(p)) for column, p in zip(columns, row))
+                self.f.write(json.dumps(document) + "\n")
+        self.rows += len(ids)
+
+
+def score_file(input_path, output_path, chunk_size=10000, workers=None,
+               platform_id="NA1", rank="Gold", id_column=None):
+    """Score every row of ``input_path`` into ``output_path``.
+
+    Returns (rows scored, sorted unmapped input names seen anywhere).
+    """
+    workers = workers or os.cpu_count() or 1
+    in_fmt = file_format(input_path) if input_path != "-" else "jsonl"
+    out_fmt = file_format(output_path) if output_path != "-" else "jsonl"
+    unmapped = set()
+
+    with open_text(input_path, "r") as src, open_text(output_path, "w") as dst, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        writer = ResultWriter(dst, out_fmt, id_column or "row")
+        pending = deque()
+
+        def write_oldest():
+            ids, winners, proba, classes, chunk_unmapped = pending.popleft().result()
+            writer.write(ids, winners, proba, classes)
+            unmapped.update(chunk_unmapped)
+
+        first_row = 0
+        for header, rows in iter_chunks(src, in_fmt, chunk_size):
+            # Keep only a bounded number of chunks in flight; write in submission order
+            if len(pending) >= 2 * workers:
+                write_oldest()
+            pending.append(pool.submit(score_chunk, first_row, header, rows, platform_id, rank, id_column))
+            first_row += len(rows)
+        while pending:
+            write_oldest()
+
+    return writer.rows, sorted(unmapped)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV/JSONL file of snapshots with the win predictor.")
+    parser.add_argument("input", help="Snapshot file (.csv, .jsonl, optionally .gz; - for JSONL on stdin)")
+    parser.add_argument("output", help="Result file (.csv or .jsonl, optionally .gz; - for JSONL on stdout)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--platform", default="NA1", help="platform_id for rows without one")
+    parser.add_argument("--rank", default="Gold", help="rank for rows without one")
+    parser.add_argument("--id-column", help="Input field copied to the output instead of the row number")
+    args = parser.parse_args(argv)
+
+    rows, unmapped = score_file(
+        args.input, args.output, args.chunk_size, args.workers, args.platform, args.rank, args.id_column
+    )
+    print(f"Scored {rows} rows", file=sys.stderr)
+    if unmapped:
+        print(f"Inputs with no matching model column were ignored: {', '.join(unmapped)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Seeded synthetic inputs for the benchmarks and tests.
+
+Live payloads come from ``mock_live_server.SyntheticGame``; snapshots are
+random but plausible dicts in the predictor's format. The same seed always
+gives the same inputs.
+"""
+import numpy as np
+
+
+def synthetic_payload(n_events, seed=0):
+    """An ``allgamedata`` payload from a finished synthetic game, cut to ``n_events`` events."""
+    from mock_live_server import SyntheticGame
+
+    duration = 40 * 60
+    game = SyntheticGame(seed=seed, duration=duration, events_per_minute=n_events * 1.5 / 40 + 1,
+                         speed=0, start_at=duration)
+    payload = game.route("/liveclientdata/allgamedata", {})
+    payload["events"]["Events"] = payload["events"]["Events"][:n_events]
+    return payload
+
+
+def synthetic_snapshots(n, seed=0):
+    """``n`` random but plausible snapshot dicts (see ``predictor``)."""
+    from champions import champion_list
+    from feature_encoder import N_PLAYERS, PLAYER_STATS
+    from game_state import COUNT_OBJECTIVES, FLAG_OBJECTIVES
+
+    rng = np.random.default_rng(seed)
+    limits = {"kills": 15, "deaths": 15, "assists": 20, "total_minions_killed": 300, "level": 18}
+    stats = {stat: rng.integers(0, limits[stat], size=(n, N_PLAYERS)) for stat in PLAYER_STATS}
+    champions = rng.integers(0, len(champion_list), size=(n, N_PLAYERS))
+    counts = rng.integers(0, 5, size=(n, 2, len(COUNT_OBJECTIVES)))
+    flags = rng.integers(0, 2, size=(n, 2, len(FLAG_OBJECTIVES)))
+    times = rng.integers(600, 2400, size=n)
+    platforms = rng.choice(["NA1", "EUW1", "KR"], size=n)
+    ranks = rng.choice(["Iron", "Bronze", "Silver", "Gold", "Platinum", "Diamond", "Master", "Challenger"], size=n)
+
+    snapshots = []
+    for r in range(n):
+        snapshot = {}
+        for i in range(N_PLAYERS):
+            for stat in PLAYER_STATS:
+                snapshot[f"{stat}_p{i+1}"] = int(stats[stat][r, i]) + (stat == "level")
+            snapshot[f"champion_p{i+1}"] = champion_list[champions[r, i]]
+        for t, team in enumerate((100, 200)):
+            for o, name in enumerate(COUNT_OBJECTIVES):
+                snapshot[f"{name}_{team}"] = int(counts[r, t, o])
+            for o, name in enumerate(FLAG_OBJECTIVES):
+                snapshot[f"{name}_{team}"] = int(flags[r, t, o])
+        snapshot["snapshot_time_sec"] = float(times[r])
+        snapshot["platform_id"] = str(platforms[r])
+        snapshot["rank"] = str(ranks[r])
+        snapshots.append(snapshot)
+    return snapshots
@@ -0,0 +1,90 @@
+"""GameState encoding matches the snapshot-dict path column for column."""
+import numpy as np
+import pytest
+
+from synthetic import synthetic_payload, synthetic_snapshots
+from feature_encoder import get_encoder
+from game_state import DRAGON_SLOTS, DRAGON_TYPES, TEAMS, GameState, GameStateLayout
+from live_data import EventReducer, game_from_live_data
+
+
+def random_games(n, seed=0):
+    """States from synthetic snapshots with random dragons (including elders) in random order."""
+    rng = np.random.default_rng(seed)
+    games = []
+    for snapshot in synthetic_snapshots(n, seed):
+        game = GameState.from_snapshot(snapshot)
+        for team in TEAMS:
+            taken = rng.integers(0, DRAGON_SLOTS + 1)
+            game.set_dragons(team, list(rng.choice(DRAGON_TYPES, size=taken)))
+        games.append(game)
+    return games
+
+
+def assert_encodes_like_snapshots(games):
+    encoder = get_encoder()
+    X, unmapped = GameStateLayout(encoder).encode(games)
+    expected, expected_unmapped = encoder.encode_batch([game.to_snapshot() for game in games])
+    np.testing.assert_array_equal(X, expected)
+    assert unmapped == expected_unmapped
+
+
+def test_encode_matches_snapshots():
+    assert_encodes_like_snapshots(random_games(200, seed=1))
+
+
+def test_encode_matches_snapshots_with_unknown_values():
+    games = random_games(20, seed=2)
+    games[0].champions[3] = "NotAChampion"
+    games[1].rank = "Wood"
+    games[2].platform_id = "PBE1"
+    assert_encodes_like_snapshots(games)
+
+
+@pytest.mark.parametrize("n_events", [0, 40, 400])
+def test_encode_matches_snapshots_from_live_payloads(n_events):
+    games = [game_from_live_data(synthetic_payload(n_events, seed), EventReducer()) for seed in range(5)]
+    assert_encodes_like_snapshots(games)
+
+
+def test_dragon_types_are_encoded():
+    encoder = get_encoder()
+    game = GameState()
+    game.set_dragons(100, ["Infernal", "Infernal", "Elder"])
+    game.set_dragons(200, ["Cloud"])
+    X, _ = GameStateLayout(encoder).encode([game])
+    row = dict(zip(encoder.feature_columns, X[0]))
+    assert row["dragons_100"] == 3 and row["fire_dragon_100"] == 2 and row["elder_dragon_100"] == 1
+    assert row["dragons_200"] == 1 and row["air_dragon_200"] == 1 and row["water_dragon_200"] == 0
+
+
+def test_snapshot_round_trip():
+    for game in random_games(50, seed=3):
+        again = GameState.from_snapshot(game.to_snapshot())
+        # Slot order is not part of a snapshot, only the per-type counts
+        np.testing.assert_array_equal(again.dragon_type_counts(), game.dragon_type_counts())
+        again.dragon_types[:] = game.dragon_types
+        assert again == game
+
+
+def test_snapshot_without_dragon_types_keeps_the_count():
+    snapshot = synthetic_snapshots(1, seed=4)[0]
+    game = GameState.from_snapshot(snapshot)
+    assert game.objective("dragons", 100) == snapshot["dragons_100"]
+    assert not game.dragon_types.any()
+
+
+def test_widget_state_round_trip():
+    for game in random_games(50, seed=5):
+        state = game.widget_state()
+        assert GameState.from_widget_state(state, game.platform_id, game.rank) == game
+
+
+def test_fractional_snapshot_values_are_kept():
+    snapshot = synthetic_snapshots(1, seed=6)[0]
+    snapshot["total_minions_killed_p1"] = 123.5
+    snapshot["towers_200"] = 2.5
+    game = GameState.from_snapshot(snapshot)
+    assert game.to_snapshot()["total_minions_killed_p1"] == 123.5
+    assert game.objective("towers", 200) == 2.5
+    assert_encodes_like_snapshots([game])
@@ -0,0 +1,28 @@
+"""The NumPy export scores like the joblib model it was exported from."""
+import joblib
+import numpy as np
+import pandas as pd
+
+from synthetic import synthetic_snapshots
+from feature_encoder import get_encoder, load_feature_columns
+from numpy_model import NUMPY_MODEL_PATH, SOURCE_MODEL_PATH, NumpyModel, file_sha256
+
+
+def test_export_matches_sklearn():
+    sklearn_model = joblib.load(SOURCE_MODEL_PATH)
+    exported = NumpyModel.load(NUMPY_MODEL_PATH)
+    assert exported.source_sha256 == file_sha256(SOURCE_MODEL_PATH)
+    assert exported.feature_columns == load_feature_columns()
+    np.testing.assert_array_equal(exported.classes_, sklearn_model.classes_)
+
+    X, _ = get_encoder().encode_batch(synthetic_snapshots(500, seed=1))
+    frame = pd.DataFrame(X, columns=exported.feature_columns)
+    np.testing.assert_allclose(exported.predict_proba(X), sklearn_model.predict_proba(frame), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(exported.predict(X), sklearn_model.predict(frame))
+
+
+def test_from_estimator_reproduces_artifact():
+    exported = NumpyModel.from_estimator(joblib.load(SOURCE_MODEL_PATH), load_feature_columns())
+    saved = NumpyModel.load(NUMPY_MODEL_PATH)
+    np.testing.assert_allclose(exported.coef, saved.coef, rtol=1e-12, atol=0)
+    assert abs(exported.intercept - saved.intercept) < 1e-12
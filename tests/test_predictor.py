@@ -0,0 +1,72 @@
+"""The split static/dynamic logit of ``predict_games`` equals a full evaluation."""
+import numpy as np
+import pytest
+
+from synthetic import synthetic_payload, synthetic_snapshots
+from game_state import DRAGON_SLOTS, DRAGON_TYPES, TEAMS, GameState
+from live_data import EventReducer, game_from_live_data
+from numpy_model import SOURCE_MODEL_PATH
+from predictor import Predictor
+
+
+def sample_games(seed=0):
+    """Random states (some sharing a lineup), live-reduced states and unknown values."""
+    rng = np.random.default_rng(seed)
+    games = []
+    for snapshot in synthetic_snapshots(100, seed):
+        game = GameState.from_snapshot(snapshot)
+        for team in TEAMS:
+            game.set_dragons(team, list(rng.choice(DRAGON_TYPES, size=rng.integers(0, DRAGON_SLOTS + 1))))
+        games.append(game)
+    # Later polls of the same games hit the static-term cache
+    for game in games[:20]:
+        later = game.copy()
+        later.stats += 1
+        later.game_time += 60
+        games.append(later)
+    games += [game_from_live_data(synthetic_payload(n, seed=n), EventReducer()) for n in (0, 50, 300)]
+    games[0].champions[7] = "NotAChampion"
+    games[1].rank = "Wood"
+    games[2].platform_id = "PBE1"
+    games[3].platform_id = games[3].rank = None
+    return games
+
+
+@pytest.fixture(params=["npz", "joblib"])
+def predictor(request):
+    if request.param == "npz":
+        return Predictor()
+    return Predictor(model_path=SOURCE_MODEL_PATH)
+
+
+def test_split_logit_matches_full_evaluation(predictor):
+    assert predictor.static_terms is not None
+    games = sample_games()
+    expected_winners, expected = predictor.predict_matrix(predictor.encode_games(games)[0])
+    for _ in range(2):
+        winners, proba = predictor.predict_games(games)
+        np.testing.assert_allclose(proba, expected, rtol=0, atol=1e-12)
+        np.testing.assert_array_equal(winners, expected_winners)
+    assert predictor.static_terms.stats()["hits"] > 0
+
+
+def test_without_static_cache_uses_full_evaluation():
+    predictor = Predictor(static_cache_size=0)
+    assert predictor.static_terms is None
+    games = sample_games(seed=1)
+    _, proba = predictor.predict_games(games)
+    np.testing.assert_array_equal(proba, predictor.predict_matrix(predictor.encode_games(games)[0])[1])
+
+
+def test_cached_predictions():
+    predictor = Predictor(cache_size=10)
+    winners, proba = predictor.predict([])
+    assert winners.shape == (0,) and proba.shape == (0, 2)
+
+    snapshots = synthetic_snapshots(3, seed=2)
+    _, first = predictor.predict(snapshots)
+    _, again = predictor.predict(snapshots)
+    np.testing.assert_array_equal(again, first)
+    assert predictor.cache.stats()["hits"] == 3
+    # Cached rows own their memory instead of viewing the batch they were scored in
+    assert all(row.base is None for row in predictor.cache._entries.values())
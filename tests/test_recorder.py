@@ -0,0 +1,39 @@
+"""A game recorded from the middle of a session replays to the live state and its result."""
+import glob
+
+import pytest
+
+from backtest import iter_games, replay_game
+from live_client import LiveClient, LivePoller
+from mock_live_server import SyntheticGame, serve_in_thread
+from predictor import Predictor
+from recorder import GameRecorder
+
+
+@pytest.mark.parametrize("mark_gap", [True, False])
+def test_recording_started_mid_session(tmp_path, mark_gap):
+    # speed=0 freezes the mock's clock; the test moves it with start_at
+    game = SyntheticGame(seed=3, duration=30 * 60, events_per_minute=20, speed=0)
+    base_url, stop = serve_in_thread(game)
+    try:
+        poller = LivePoller(LiveClient(base_url), Predictor())
+        for minute in range(2, 12, 2):
+            game.start_at = minute * 60
+            assert poller.poll_once() is not None
+
+        recorder = GameRecorder(str(tmp_path), on_gap=poller.request_resync)
+        if mark_gap:
+            recorder.mark_gap()
+        poller.on_update = recorder.record_update
+        for minute in range(12, 32, 2):
+            game.start_at = minute * 60
+            assert poller.poll_once() is not None
+        recorder.close()
+    finally:
+        stop()
+
+    (_, payloads), = iter_games(glob.glob(str(tmp_path / "*.jsonl.gz")))
+    games, winner = replay_game(payloads)
+    assert games
+    assert games[-1] == poller.latest.game
+    assert winner == game.winner
@@ -0,0 +1,122 @@
+"""Per-game win-probability history kept in fixed-capacity ring buffers."""
+from collections import OrderedDict
+
+import numpy as np
+
+OBJECTIVE_SUMMARY = [
+    (objective, team)
+    for objective in ["dragons", "barons", "towers", "heralds", "voidgrubs"]
+    for team in (100, 200)
+]
+OBJECTIVE_SUMMARY_FIELDS = [f"{objective}_{team}" for objective, team in OBJECTIVE_SUMMARY]
+
+
+def game_key(game):
+    """Identify a game (a ``GameState``) by its lineup, which never changes within a game."""
+    return tuple(game.champions)
+
+
+class ProbabilityTimeline:
+    """Ring buffer of (game time, team probabilities, objectives) for one game.
+
+    Points closer than ``min_spacing`` seconds of game time replace the newest
+    point instead of adding one, so the default capacity covers an hour of
+    game at any polling rate. Memory is fixed at construction.
+    """
+
+    def __init__(self, capacity=720, min_spacing=5.0):
+        self.capacity = capacity
+        self.min_spacing = min_spacing
+        self.game_time = np.zeros(capacity, dtype=np.float32)
+        self.proba = np.zeros((capacity, 2), dtype=np.float32)
+        self.objectives = np.zeros((capacity, len(OBJECTIVE_SUMMARY_FIELDS)), dtype=np.int16)
+        self.clear()
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+        self.version = 0
+        self._chart = None
+        self._chart_version = -1
+
+    def __len__(self):
+        return self.size
+
+    def _slot(self, i):
+        return (self.start + i) % self.capacity
+
+    @property
+    def last_game_time(self):
+        return float(self.game_time[self._slot(self.size - 1)]) if self.size else None
+
+    def append(self, game_time, proba, game):
+        """Record a prediction; a clock that runs backwards starts over."""
+        last = self.last_game_time
+        if last is not None and game_time < last:
+            self.clear()
+            last = None
+
+        if last is not None and game_time - last < self.min_spacing:
+            slot = self._slot(self.size - 1)
+        elif self.size < self.capacity:
+            slot = self._slot(self.size)
+            self.size += 1
+        else:
+            slot = self.start
+            self.start = self._slot(1)
+
+        self.game_time[slot] = game_time
+        self.proba[slot] = proba
+        self.objectives[slot] = [game.objective(objective, team) for objective, team in OBJECTIVE_SUMMARY]
+        self.version += 1
+
+    def _ordered(self, arr):
+        end = self.start + self.size
+        if end <= self.capacity:
+            return arr[self.start:end]
+        return np.concatenate((arr[self.start:], arr[:end - self.capacity]))
+
+    def arrays(self):
+        """(game_time, proba, objectives) in chronological order."""
+        return self._ordered(self.game_time), self._ordered(self.proba), self._ordered(self.objectives)
+
+    def chart_data(self):
+        """Chart frame indexed by game minute, rebuilt only when new points arrive."""
+        if self._chart_version != self.version:
+            import pandas as pd
+
+            game_time, proba, _ = self.arrays()
+            self._chart = pd.DataFrame(
+                {"Team 1": proba[:, 0], "Team 2": proba[:, 1]},
+                index=pd.Index(game_time / 60, name="Game minute"),
+            )
+            self._chart_version = self.version
+        return self._chart
+
+
+class TimelineStore:
+    """Timelines for the most recently seen games, bounded to ``max_games``."""
+
+    def __init__(self, max_games=5, capacity=720, min_spacing=5.0):
+        self.max_games = max_games
+        self.capacity = capacity
+        self.min_spacing = min_spacing
+        self.games = OrderedDict()
+        self.current_key = None
+
+    def record(self, game, proba):
+        key = game_key(game)
+        timeline = self.games.get(key)
+        if timeline is None:
+            timeline = ProbabilityTimeline(self.capacity, self.min_spacing)
+            self.games[key] = timeline
+            while len(self.games) > self.max_games:
+                self.games.popitem(last=False)
+        self.games.move_to_end(key)
+        self.current_key = key
+        timeline.append(game.game_time, proba, game)
+        return timeline
+
+    @property
+    def current(self):
+        return self.games.get(self.current_key)
@@ -0,0 +1,286 @@
+"""Out-of-core retraining of the deployed logistic model.
+
+Labelled snapshots are streamed in chunks, so memory is bounded by
+``--chunk-size`` whatever the corpus size. Two kinds of input are accepted:
+
+* snapshot files (CSV or JSONL, optionally gzipped) with the predictor's
+  raw fields plus a label column holding the winning team (100 or 200);
+* with ``--recordings``, files written by ``recorder.py``, replayed like
+  ``backtest.py`` and labelled by their ``GameEnd`` event or ``--labels``.
+
+Passes over the data:
+
+1. with ``--rebuild-schema``, collect the numeric fields and
+   ``platform_id``/``rank`` values to build a new feature schema (by
+   default the deployed ``feature_columns.pkl`` is kept);
+2. fit a ``StandardScaler`` incrementally;
+3. ``--epochs`` passes of ``SGDClassifier(loss="log_loss").partial_fit``
+   with a constant step and weight averaging. Progressive log loss is
+   reported: each chunk is scored before it is learned from.
+
+The model is saved as a scaler + classifier ``Pipeline``. Every run is
+deployed to its own ``deployments/<version>/`` directory holding
+``feature_columns.pkl``, ``logistic_model_deployed.joblib``, the NumPy
+export and the ``model_version.json`` stamp. Only once the directory is
+complete does ``deployments/CURRENT`` switch to it, with a single rename,
+so ``Predictor`` sees either the previous deployment or the new one.
+Older deployments are kept; pointing ``CURRENT`` back at one rolls back.
+
+    python train.py snapshots.csv.gz --epochs 5
+    python train.py "recordings/*.jsonl.gz" --recordings --labels labels.json
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from champions import UNKNOWN_CLASS, all_classes, all_subclasses
+from feature_encoder import (
+    CATEGORICAL_FIELDS, CHAMPION_FIELDS, FEATURE_COLUMNS_PATH, TEAMS, FeatureEncoder, load_feature_columns,
+    normalize_category,
+)
+from numpy_model import (
+    CURRENT_DEPLOYMENT, DEPLOYMENTS_DIR, MODEL_VERSION_PATH, SOURCE_MODEL_PATH, NumpyModel, artifact_paths,
+    current_deployment, file_sha256,
+)
+from score_file import file_format, iter_chunks, open_text, parse_rows
+
+CLASSES = np.array([100, 200])
+
+
+# === Input streams ===
+
+def iter_snapshot_file_chunks(paths, chunk_size, label_column="winner", id_column=None):
+    """Yield (snapshots, labels) chunks from CSV/JSONL snapshot files."""
+    text_fields = set(CHAMPION_FIELDS) | set(CATEGORICAL_FIELDS) | {id_column}
+    for path in paths:
+        with open_text(path, "r") as f:
+            for header, rows in iter_chunks(f, file_format(path), chunk_size):
+                numeric = set(header or ()) - text_fields
+                snapshots = parse_rows(header, rows, numeric)
+                labels = []
+                for snapshot in snapshots:
+                    snapshot.pop(id_column, None)
+                    labels.append(int(float(snapshot.pop(label_column))))
+                yield snapshots, np.array(labels)
+
+
+def iter_recording_chunks(paths, chunk_size, labels=None, platform_id="NA1", rank="Gold"):
+    """Yield (snapshots, labels) chunks replayed from recordings; unlabelled games are skipped."""
+    from backtest import iter_games, replay_game
+
+    labels = labels or {}
+    snapshots, y = [], []
+    for game_id, payloads in iter_games(paths):
+        games, winner = replay_game(payloads, platform_id, rank)
+        winner = labels.get(game_id, winner)
+        if winner not in (100, 200):
+            continue
+        snapshots.extend(game.to_snapshot() for game in games)
+        y.extend([winner] * len(games))
+        while len(snapshots) >= chunk_size:
+            yield snapshots[:chunk_size], np.array(y[:chunk_size])
+            snapshots, y = snapshots[chunk_size:], y[chunk_size:]
+    if snapshots:
+        yield snapshots, np.array(y)
+
+
+def check_labels(y):
+    bad = ~np.isin(y, CLASSES)
+    if bad.any():
+        raise ValueError(f"Labels must be 100 or 200, got {sorted(set(y[bad].tolist()))[:5]}")
+
+
+# === Passes ===
+
+def build_schema(chunks):
+    """Feature columns from one pass: numeric fields in first-seen order,
+    class/subclass counts per team, then one-hot columns for the values seen."""
+    numeric = {}
+    categories = {field: set() for field in CATEGORICAL_FIELDS}
+    skip = set(CHAMPION_FIELDS) | set(CATEGORICAL_FIELDS)
+    for snapshots, _ in chunks:
+        for snapshot in snapshots:
+            for name, value in snapshot.items():
+                if name in skip:
+                    if name in categories and value not in (None, ""):
+                        categories[name].add(normalize_category(value))
+                else:
+                    numeric.setdefault(name, None)
+
+    columns = list(numeric)
+    for prefix, values in (("class", all_classes), ("subclass", all_subclasses)):
+        for team in TEAMS:
+            columns += [f"{prefix}_{team}_{value}" for value in values + [UNKNOWN_CLASS]]
+    for field in CATEGORICAL_FIELDS:
+        columns += [f"{field}_{value}" for value in sorted(categories[field])]
+    return columns
+
+
+def fit_scaler(chunks, encoder):
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    rows = 0
+    for snapshots, y in chunks:
+        check_labels(y)
+        X, _ = encoder.encode_batch(snapshots)
+        scaler.partial_fit(X)
+        rows += len(y)
+    if rows == 0:
+        raise ValueError("No labelled snapshots found")
+    return scaler, rows
+
+
+def train_epoch(chunks, encoder, scaler, classifier, rng):
+    """One partial_fit pass; return the progressive log loss."""
+    loss_sum, scored = 0.0, 0
+    for snapshots, y in chunks:
+        X, _ = encoder.encode_batch(snapshots)
+        X = scaler.transform(X)
+        if hasattr(classifier, "coef_"):
+            p200 = np.clip(classifier.predict_proba(X)[:, 1], 1e-15, 1 - 1e-15)
+            y200 = y == 200
+            loss_sum -= float(np.sum(np.where(y200, np.log(p200), np.log(1 - p200))))
+            scored += len(y)
+        order = rng.permutation(len(y))
+        classifier.partial_fit(X[order], y[order], classes=CLASSES)
+    return loss_sum / scored if scored else float("nan")
+
+
+# === Atomic deployment ===
+
+def atomic_write(path, write):
+    """Write a file through ``write(f)`` to a temporary name, then rename it into place."""
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return file_sha256(path)
+
+
+def write_version_stamp(version, model_path=SOURCE_MODEL_PATH, feature_columns_path=FEATURE_COLUMNS_PATH,
+                        version_path=MODEL_VERSION_PATH, **info):
+    """Stamp the artifacts on disk; ``Predictor`` refuses to load if they change."""
+    stamp = {
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "model_sha256": file_sha256(model_path),
+        "feature_columns_sha256": file_sha256(feature_columns_path),
+        **info,
+    }
+    atomic_write(version_path, lambda f: f.write((json.dumps(stamp, indent=2) + "\n").encode()))
+    return stamp
+
+
+def deploy(model, feature_columns, info, deployments_dir=DEPLOYMENTS_DIR):
+    """Write a complete deployment directory, then make it current with one rename."""
+    import joblib
+
+    os.makedirs(deployments_dir, exist_ok=True)
+    tmp_dir = os.path.join(deployments_dir, f".tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        paths = artifact_paths(tmp_dir)
+        atomic_write(paths.feature_columns_path, lambda f: pickle.dump(list(feature_columns), f))
+        model_sha = atomic_write(paths.model_path, lambda f: joblib.dump(model, f))
+        atomic_write(paths.numpy_path, NumpyModel.from_estimator(model, feature_columns, model_sha).save)
+        version = time.strftime("%Y%m%d%H%M%S", time.gmtime()) + "-" + model_sha[:8]
+        stamp = write_version_stamp(
+            version, paths.model_path, paths.feature_columns_path, paths.version_path, **info
+        )
+        os.rename(tmp_dir, os.path.join(deployments_dir, version))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    atomic_write(os.path.join(deployments_dir, CURRENT_DEPLOYMENT), lambda f: f.write(f"{version}\n".encode()))
+    return stamp
+
+
+def train(make_chunks, epochs=5, alpha=1e-4, eta0=0.001, rebuild_schema=False, seed=0, log=None):
+    """Fit scaler + SGD logistic regression over ``make_chunks()`` streams.
+
+    ``make_chunks`` is called once per pass and yields (snapshots, labels).
+    Returns (pipeline, feature_columns, info).
+    """
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import Pipeline
+
+    log = log or (lambda message: None)
+    if rebuild_schema:
+        feature_columns = build_schema(make_chunks())
+    else:
+        feature_columns = load_feature_columns(current_deployment().feature_columns_path)
+    encoder = FeatureEncoder(feature_columns)
+    log(f"Schema: {len(feature_columns)} columns")
+
+    scaler, rows = fit_scaler(make_chunks(), encoder)
+    log(f"Scaler fitted on {rows} snapshots")
+
+    classifier = SGDClassifier(
+        loss="log_loss", alpha=alpha, learning_rate="constant", eta0=eta0, average=True, random_state=seed
+    )
+    rng = np.random.default_rng(seed)
+    losses = []
+    for epoch in range(epochs):
+        losses.append(train_epoch(make_chunks(), encoder, scaler, classifier, rng))
+        log(f"Epoch {epoch + 1}/{epochs}: progressive log loss {losses[-1]:.4f}")
+
+    model = Pipeline([("scaler", scaler), ("model", classifier)])
+    info = {"rows": rows, "epochs": epochs, "alpha": alpha, "eta0": eta0, "n_features": len(feature_columns),
+            "progressive_log_loss": losses}
+    return model, feature_columns, info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the win predictor out of core and deploy it.")
+    parser.add_argument("paths", nargs="+", help="Snapshot files, or recordings with --recordings")
+    parser.add_argument("--recordings", action="store_true", help="Inputs are recorder.py files")
+    parser.add_argument("--labels", help="With --recordings: JSON file mapping game id to the winning team")
+    parser.add_argument("--label-column", default="winner", help="Label field of snapshot files (100 or 200)")
+    parser.add_argument("--id-column", help="Snapshot field to ignore (e.g. a match id)")
+    parser.add_argument("--platform", default="NA1", help="With --recordings: platform_id for every game")
+    parser.add_argument("--rank", default="Gold", help="With --recordings: rank for every game")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--alpha", type=float, default=1e-4, help="L2 regularization strength")
+    parser.add_argument("--eta0", type=float, default=0.001, help="SGD step size")
+    parser.add_argument("--rebuild-schema", action="store_true", help="Derive a new feature schema from the data")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--deployments-dir", default=DEPLOYMENTS_DIR,
+                        help="Where to write the deployment (the app loads deployments/ next to it)")
+    args = parser.parse_args(argv)
+
+    if args.recordings:
+        labels = None
+        if args.labels:
+            with open(args.labels) as f:
+                labels = {k: int(v) for k, v in json.load(f).items()}
+        make_chunks = lambda: iter_recording_chunks(args.paths, args.chunk_size, labels, args.platform, args.rank)
+    else:
+        make_chunks = lambda: iter_snapshot_file_chunks(args.paths, args.chunk_size, args.label_column,
+                                                        args.id_column)
+
+    started = time.perf_counter()
+    model, feature_columns, info = train(
+        make_chunks, args.epochs, args.alpha, args.eta0, args.rebuild_schema, args.seed,
+        log=lambda message: print(message, file=sys.stderr),
+    )
+    stamp = deploy(model, feature_columns, info, args.deployments_dir)
+    print(f"Deployed model version {stamp['version']} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Background wallpaper CSS, built once per process.
+
+The wallpaper is served by Streamlit's static file server from ``static/``
+as pre-generated downscaled variants, picked by viewport width through CSS
+media queries. Regenerate the variants after changing the source image with
+``python wallpaper.py``. If no variants exist, the source image is inlined
+as a data URI, encoded once per process rather than on every rerun.
+"""
+import functools
+import os
+from base64 import b64encode
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WALLPAPER_SOURCE = os.path.join(BASE_DIR, "League Of Legends Wallpaper.jpg")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+STATIC_URL = "app/static"
+
+# Variant widths in ascending order; the last one is used above every breakpoint
+WALLPAPER_WIDTHS = [800, 1280, 1920]
+WALLPAPER_QUALITY = 75
+
+WALLPAPER_CSS = """
+<style>
+/* Transparent background for the main app container */
+.stApp {
+    background-color: transparent !important;
+}
+
+/* Add wallpaper as a fixed layer behind everything */
+.stApp::before {
+    content: "";
+    position: fixed;
+    top: 0; left: 0; right: 0; bottom: 0;
+    background-size: cover;
+    background-position: center;
+    background-repeat: no-repeat;
+    z-index: -1;
+    pointer-events: none;
+}
+%(background_rules)s
+/* Add filter on a pseudo-element above the wallpaper */
+.stApp::after {
+    content: "";
+    position: fixed;
+    top: 0; left: 0; right: 0; bottom: 0;
+    background-color: rgba(0, 0, 0, 0.4); /* darken */
+    backdrop-filter: brightness(40%%) contrast(100%%);
+    z-index: -1;
+    pointer-events: none;
+}
+</style>
+"""
+
+
+def variant_name(width):
+    return f"wallpaper_{width}.jpg"
+
+
+def generate_variants(source=WALLPAPER_SOURCE, static_dir=STATIC_DIR, widths=WALLPAPER_WIDTHS):
+    """Write progressive JPEG variants of the wallpaper into ``static_dir``."""
+    from PIL import Image
+
+    os.makedirs(static_dir, exist_ok=True)
+    with Image.open(source) as im:
+        im = im.convert("RGB")
+        for width in widths:
+            height = round(im.height * width / im.width)
+            variant = im if width >= im.width else im.resize((width, height), Image.LANCZOS)
+            variant.save(
+                os.path.join(static_dir, variant_name(width)),
+                "JPEG", quality=WALLPAPER_QUALITY, optimize=True, progressive=True,
+            )
+
+
+def background_rule(url, max_width=None):
+    rule = f'.stApp::before {{ background-image: url("{url}"); }}'
+    if max_width is None:
+        return rule
+    return f"@media (max-width: {max_width}px) {{ {rule} }}"
+
+
+@functools.lru_cache(maxsize=None)
+def wallpaper_css(static_dir=STATIC_DIR):
+    """The wallpaper ``<style>`` block, computed once per process."""
+    widths = [w for w in WALLPAPER_WIDTHS if os.path.exists(os.path.join(static_dir, variant_name(w)))]
+    if widths:
+        # Largest variant by default, smaller ones below their own width
+        rules = [background_rule(f"{STATIC_URL}/{variant_name(widths[-1])}")]
+        rules += [background_rule(f"{STATIC_URL}/{variant_name(w)}", w) for w in reversed(widths[:-1])]
+    else:
+        with open(WALLPAPER_SOURCE, "rb") as f:
+            data = b64encode(f.read()).decode()
+        rules = [background_rule(f"data:image/jpeg;base64,{data}")]
+    return WALLPAPER_CSS % {"background_rules": "\n".join(rules) + "\n"}
+
+
+if __name__ == "__main__":
+    generate_variants()
+    for width in WALLPAPER_WIDTHS:
+        path = os.path.join(STATIC_DIR, variant_name(width))
+        print(f"{path}: {os.path.getsize(path) // 1024} KB")
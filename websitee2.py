@@ -1,26 +1,68 @@
+import time
+
 import streamlit as st
 import pandas as pd
-import joblib
-import requests
-import urllib3
 
-# Disable SSL warnings for localhost calls to LiveClientData
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from champions import champion_list, roles
+from latency import stage_timings, timed
+from live_client import LiveClient, LivePoller
+from game_state import GameState
+from live_feed import LiveFeed
+from live_monitor import LiveMonitor
+from predictor import Predictor
+from recorder import GameRecorder
+from timeline import TimelineStore
+from what_if import evaluate_scenarios, feature_contributions
+from wallpaper import wallpaper_css
+
+render_started = time.perf_counter()
 
 # Page config and title
 st.set_page_config(layout="wide")
 st.title("🏆 League of Legends Mid-Game Win Predictor (Only accurate after 15 min)")
 
-# Load model and champion class CSV once at startup
-model = joblib.load("logistic_model_deployed.joblib")
-champion_classes_df = pd.read_csv("champion_classes.csv")
-champion_classes_df['subclass'] = champion_classes_df['subclass'].fillna(champion_classes_df['class'])
-champion_class_map = champion_classes_df.set_index("name")[["class", "subclass"]].to_dict(orient="index")
-all_classes = champion_classes_df["class"].unique().tolist()
-all_subclasses = champion_classes_df["subclass"].unique().tolist()
+# Load model and feature encoder once per process, shared by all sessions;
+# predictions are memoized per encoded feature vector
+@st.cache_resource
+def load_predictor():
+    return Predictor(cache_size=4096)
+
+
+predictor = load_predictor()
+st.caption(f"Model version {predictor.model_version}")
+
+
+@st.cache_resource
+def get_live_client():
+    return LiveClient()
+
+
+# A payload the recorder had to drop makes the poller refetch the full event list
+@st.cache_resource
+def get_recorder():
+    return GameRecorder(on_gap=get_live_feed().poller.request_resync)
+
+
+# One poller per process; every session subscribes to the same feed
+@st.cache_resource
+def get_live_feed():
+    return LiveFeed(LivePoller(get_live_client(), predictor))
+
+
+live_feed = get_live_feed()
+
+
+# Several live games (other machines or forwarded ports) polled on one event loop
+@st.cache_resource
+def get_live_monitor():
+    monitor = LiveMonitor(predictor)
+    monitor.start()
+    return monitor
+
+# Sessions that stop rerunning for this long are unsubscribed
+SUBSCRIPTION_IDLE_TIMEOUT = 120
+
 
-roles = ["Top", "Jungle", "Mid", "ADC", "Support"]
-champion_list = champion_classes_df["name"].tolist()
 dragon_types = [
     "None",
     "Infernal",
@@ -34,235 +76,12 @@ dragon_types = [
 
 # === Function Definitions ===
 
-def load_live_data():
-    """Fetch live match data from the Riot Local LiveClientData API."""
-    try:
-        r = requests.get("https://127.0.0.1:2999/liveclientdata/allgamedata", timeout=1, verify=False)
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return None
-    except Exception:
-        return None
-
-def fill_inputs_from_live_data(live_data):
-    global champion_list
-    participants = live_data.get("allPlayers", [])
-    active_player = live_data.get("activePlayer", None)
-
-    # Add active player manually if not already in allPlayers
-    if active_player and active_player.get("summonerName") not in [p.get("summonerName") for p in participants]:
-        active_stats = active_player.get("championStats", {})
-        active_scores = active_player.get("scores", {})
-        active_data = {
-            "summonerName": active_player.get("summonerName", "You"),
-            "championName": active_player.get("championName", "Unknown"),
-            "level": active_stats.get("level", 1),
-            "position": "",  # Riot doesn't provide this here
-            "team": "ORDER",  # Default guess (red side)
-            "scores": active_scores
-        }
-        participants.append(active_data)
-
-    roles = ["Top", "Jungle", "Mid", "ADC", "Support"]
-
-    role_map_live_to_ui = {
-        "TOP": "Top",
-        "JUNGLE": "Jungle",
-        "MIDDLE": "Mid",
-        "MID": "Mid",
-        "BOTTOM": "ADC",
-        "ADC": "ADC",
-        "SUPPORT": "Support",
-        "UTILITY": "Support"
-    }
-
-    team_map = {100: "t1", 200: "t2"}
-
-    def map_team(team_str):
-        team_str = team_str.upper()
-        return 100 if team_str == "ORDER" else 200 if team_str == "CHAOS" else None
-
-    role_order_map = {role: i for i, role in enumerate(roles)}
-
-    def sort_key(p):
-        team_num = map_team(p.get("team", ""))
-        raw_role = p.get("position", "").upper()
-        ui_role = role_map_live_to_ui.get(raw_role, None)
-        team_sort = team_num if team_num in team_map else 99
-        role_sort = role_order_map.get(ui_role, 99) if ui_role else 99
-        return (team_sort, role_sort)
-
-    participants.sort(key=sort_key)
-
-    role_assigned = {"t1": set(), "t2": set()}
-
-    for p in participants:
-        team_num = map_team(p.get("team", ""))
-        if team_num not in team_map:
-            continue
-        team_id = team_map[team_num]
-
-        raw_role = p.get("position", "").upper()
-        ui_role = role_map_live_to_ui.get(raw_role)
-
-        if ui_role not in roles or ui_role in role_assigned[team_id]:
-            for r in roles:
-                if r not in role_assigned[team_id]:
-                    ui_role = r
-                    break
-            else:
-                continue
-
-        role_assigned[team_id].add(ui_role)
-        prefix = f"{team_id}_{ui_role}"
-
-        scores = p.get("scores", {})
-        cs_val = scores.get("creepScore", 0)
-        champ_name = p.get("championName", "Unknown")
-        if champ_name not in champion_list:
-            champ_name = champion_list[0]
-
-        level = p.get("level", 1)
-
-        st.session_state[f"k_{prefix}"] = scores.get("kills", 0)
-        st.session_state[f"d_{prefix}"] = scores.get("deaths", 0)
-        st.session_state[f"a_{prefix}"] = scores.get("assists", 0)
-        st.session_state[f"cs_{prefix}"] = cs_val
-        st.session_state[f"gold_{prefix}"] = 0
-        st.session_state[f"champ_{prefix}"] = champ_name
-        st.session_state[f"level_{prefix}"] = level
-
-    events = live_data.get("events", {}).get("Events", [])
-    participants = live_data.get("allPlayers", [])
-
-    barons = {100: 0, 200: 0}
-    towers = {100: 0, 200: 0}
-    heralds = {100: False, 200: False}
-    first_blood_team = None
-    first_turret_team = None
-
-    voidgrubs = {100: 0, 200: 0}
-
-    epic_camps = ["Dragon", "RiftHerald", "Baron"]
-    epic_camps_taken_count = {100: 0, 200: 0}
-    first_three_epic_camps_winner = None
-
-    first_three_kills_count = {100: 0, 200: 0}
-    first_three_kills_winner = None
-
-    dragon_types_list = ["Infernal", "Mountain", "Ocean", "Cloud", "Hextech", "Chemtech", "Elder"]
-    dragon_counts = {100: {d: 0 for d in dragon_types_list}, 200: {d: 0 for d in dragon_types_list}}
-
-    dragon_type_map = {
-        "INFERNAL": "Infernal",
-        "MOUNTAIN": "Mountain", "EARTH": "Mountain",
-        "OCEAN": "Ocean", "WATER": "Ocean",
-        "CLOUD": "Cloud", "AIR": "Cloud",
-        "HEXTECH": "Hextech",
-        "CHEMTECH": "Chemtech",
-        "ELDER": "Elder"
-    }
-
-    def resolve_team_from_name(name):
-        for p in participants:
-            if p.get("summonerName") == name:
-                return 100 if p.get("team", "").upper() == "ORDER" else 200
-        return None
-
-    def is_epic_camp(event_name):
-        return any(ec.lower() in event_name.lower() for ec in epic_camps)
-
-    camp_counter = {100: 0, 200: 0}
-    kill_counter = {100: 0, 200: 0}
-
-    first_blood_recorded = False
-
-    for e in events:
-        ev_name = e.get("EventName", "")
-        killer_team = e.get("killerTeam")
-        if not killer_team:
-            killer_name = e.get("KillerName") or e.get("Acer")
-            killer_team = resolve_team_from_name(killer_name)
-
-        if killer_team not in (100, 200):
-            continue
-
-        if ev_name == "ChampionKill" and not first_blood_recorded:
-            first_blood_team = killer_team
-            first_blood_recorded = True
-
-        if ev_name == "DragonKill":
-            raw_type = e.get("DragonType", "") or e.get("monsterType", "")
-            dt = dragon_type_map.get(raw_type.strip().upper(), None)
-            if dt:
-                dragon_counts[killer_team][dt] += 1
-
-        elif ev_name in ("RiftHeraldKill", "HeraldKill"):
-            heralds[killer_team] = True
-
-        elif ev_name == "BaronKill":
-            barons[killer_team] += 1
-
-        elif ev_name == "TurretKilled":
-            towers[killer_team] += 1
-            if first_turret_team is None:
-                first_turret_team = killer_team
-
-        elif ev_name == "VoidGrubKill":
-            voidgrubs[killer_team] += 1
-
-        elif ev_name == "ChampionKill":
-            if kill_counter[killer_team] < 3:
-                kill_counter[killer_team] += 1
-                if kill_counter[killer_team] == 3 and first_three_kills_winner is None:
-                    first_three_kills_winner = killer_team
-
-        if is_epic_camp(ev_name):
-            if camp_counter[killer_team] < 3:
-                camp_counter[killer_team] += 1
-                if camp_counter[killer_team] == 3 and first_three_epic_camps_winner is None:
-                    first_three_epic_camps_winner = killer_team
-
-    st.session_state["b100"] = barons[100]
-    st.session_state["b200"] = barons[200]
-    st.session_state["t100"] = towers[100]
-    st.session_state["t200"] = towers[200]
-    st.session_state["herald_100"] = "Yes" if heralds[100] else "No"
-    st.session_state["herald_200"] = "Yes" if heralds[200] else "No"
-    st.session_state["fb100"] = "Yes" if first_blood_team == 100 else "No"
-    st.session_state["fb200"] = "Yes" if first_blood_team == 200 else "No"
-    st.session_state["first_turret_100"] = "Yes" if first_turret_team == 100 else "No"
-    st.session_state["first_turret_200"] = "Yes" if first_turret_team == 200 else "No"
-    st.session_state["voidgrubs_100"] = voidgrubs[100]
-    st.session_state["voidgrubs_200"] = voidgrubs[200]
-    st.session_state["first_three_epic_camps_100"] = "Yes" if first_three_epic_camps_winner == 100 else "No"
-    st.session_state["first_three_epic_camps_200"] = "Yes" if first_three_epic_camps_winner == 200 else "No"
-    st.session_state["first_three_kills_100"] = "Yes" if first_three_kills_winner == 100 else "No"
-    st.session_state["first_three_kills_200"] = "Yes" if first_three_kills_winner == 200 else "No"
-
-    def fill_dragons(team_key, team_num):
-        expanded = []
-        for dt in dragon_types_list:
-            expanded.extend([dt] * dragon_counts[team_num][dt])
-        for i in range(5):
-            val = expanded[i] if i < len(expanded) else "None"
-            st.session_state[f"drag{team_key}_{i}"] = val
-
-    fill_dragons("100", 100)
-    fill_dragons("200", 200)
-
-    game_time_sec = live_data.get("gameData", {}).get("gameTime", 0)
-    snapshot_min = int(game_time_sec // 60)
-    st.session_state["snapshot_time_min"] = snapshot_min
-    st.session_state["snapshot_time_sec_partial"] = game_time_sec % 60
-
-
-
-
-
-
-
+def render_timeline(timeline):
+    """Win probability over game time for the current game."""
+    if timeline is None or len(timeline) == 0:
+        return
+    st.markdown("## 📈 Win probability timeline")
+    st.line_chart(timeline.chart_data(), y_label="Win probability")
 
 def player_input_extended(team_id, role):
     st.markdown(f"<div class='player-header'>{role}</div>", unsafe_allow_html=True)
@@ -279,33 +98,6 @@ def player_input_extended(team_id, role):
 
     return kills, deaths, assists, cs, champ, level
 
-def get_class_subclass_features(champs):
-    features = {f: 0 for f in (
-        [f"class_100_{c}" for c in all_classes] +
-        [f"class_200_{c}" for c in all_subclasses] +
-        [f"subclass_100_{s}" for s in all_subclasses] +
-        [f"subclass_200_{s}" for s in all_subclasses]
-    )}
-    for i, champ in enumerate(champs):
-        prefix = "100" if i < 5 else "200"
-        info = champion_class_map.get(champ)
-
-        if info is None:
-            cls = "None"
-            subcls = "None"
-        else:
-            cls = info["class"]
-            subcls = info["subclass"]
-
-        cls_key = f"class_{prefix}_{cls}"
-        subcls_key = f"subclass_{prefix}_{subcls}"
-
-        if cls_key in features:
-            features[cls_key] += 1
-        if subcls_key in features:
-            features[subcls_key] += 1
-    return features
-
 def dragon_selectboxes(team_prefix):
     dragons = []
     chosen_dragons = set()
@@ -317,17 +109,96 @@ def dragon_selectboxes(team_prefix):
             chosen_dragons.add(selected)
     return dragons
 
+@st.fragment
+def team_players_section(team_id, title):
+    """Stat and champion inputs for the five players of one team."""
+    st.markdown(title)
+
+    for role in roles:
+        st.markdown(f'<div class="role-header">{role}</div>', unsafe_allow_html=True)
+        cols_kda = st.columns(3)
+        with cols_kda[0]:
+            st.number_input("Kills", 0, 100, step=1, key=f"k_{team_id}_{role}")
+        with cols_kda[1]:
+            st.number_input("Deaths", 0, 100, step=1, key=f"d_{team_id}_{role}")
+        with cols_kda[2]:
+            st.number_input("Assists", 0, 100, step=1, key=f"a_{team_id}_{role}")
+
+        st.number_input("CS (Minions Killed)", 0, 2000, step=1, key=f"cs_{team_id}_{role}")
+        st.selectbox("Champion", champion_list, key=f"champ_{team_id}_{role}")
+        st.number_input("Level", 1, 18, step=1, key=f"level_{team_id}_{role}")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+@st.fragment
+def objectives_section():
+    st.markdown("## 🏹 Objectives")
+    col_obj1, col_obj2 = st.columns(2)
+
+    with col_obj1:
+        st.markdown('<div class="objectives-col">', unsafe_allow_html=True)
+        dragon_selectboxes("100")
+        st.slider("Barons (Team 100)", 0, 2, 0, step=1, key="b100")
+        st.slider("Towers (Team 100)", 0, 11, 0, step=1, key="t100")
+        herald_100 = st.radio("Rift Herald Taken (Team 100)", ["No", "Yes"], key="herald_100", horizontal=True)
+        first_blood_100 = st.radio("First Blood Taken (Team 100)", ["No", "Yes"], key="fb100", horizontal=True)
+        st.radio("First Turret Taken (Team 100)", ["No", "Yes"], key="first_turret_100", horizontal=True)
+        st.slider("Void Grubs Killed (Team 100)", 0, 3, 0, step=1, key="voidgrubs_100")
+        st.radio("First Three Epic Camps Taken (Team 100)", ["No", "Yes"], key="first_three_epic_camps_100", horizontal=True)
+        st.radio("First Three Kills Taken (Team 100)", ["No", "Yes"], key="first_three_kills_100", horizontal=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with col_obj2:
+        st.markdown('<div class="objectives-col">', unsafe_allow_html=True)
+        dragon_selectboxes("200")
+        st.slider("Barons (Team 200)", 0, 2, 0, step=1, key="b200")
+        st.slider("Towers (Team 200)", 0, 11, 0, step=1, key="t200")
+        herald_200 = st.radio("Rift Herald Taken (Team 200)", ["No", "Yes"], key="herald_200", horizontal=True)
+        first_blood_200 = st.radio("First Blood Taken (Team 200)", ["No", "Yes"], key="fb200", horizontal=True)
+        st.radio("First Turret Taken (Team 200)", ["No", "Yes"], key="first_turret_200", horizontal=True)
+        st.slider("Void Grubs Killed (Team 200)", 0, 3, 0, step=1, key="voidgrubs_200")
+        st.radio("First Three Epic Camps Taken (Team 200)", ["No", "Yes"], key="first_three_epic_camps_200", horizontal=True)
+        st.radio("First Three Kills Taken (Team 200)", ["No", "Yes"], key="first_three_kills_200", horizontal=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # Rift Herald and First Blood exclusivity warnings
+    if herald_100 == "Yes" and herald_200 == "Yes":
+        st.warning("⚠️ Rift Herald can only be taken by one team!")
+    if first_blood_100 == "Yes" and first_blood_200 == "Yes":
+        st.warning("⚠️ First Blood can only be taken by one team!")
+
+@st.fragment
+def metadata_section():
+    st.markdown("## 🗂 Metadata")
+
+    col_min, col_sec = st.columns([1, 1])
+    with col_min:
+        snapshot_min = st.number_input("Minutes", 0, 120, value=22, step=1, key="snapshot_time_min")
+    with col_sec:
+        snapshot_sec = st.number_input("Seconds", 0, 59, value=0, step=1, key="snapshot_time_sec_partial")
+
+    if snapshot_min * 60 + snapshot_sec == 0:
+        st.warning("⏱️ Please enter a snapshot time greater than 0 before predicting.")
+
 # === Live Match Data Controls ===
 col_load, col_clear = st.columns([1, 1])
 
 with col_load:
     if st.button("🔄 Load Live Match Data"):
-        live_data = load_live_data()
-        if live_data is None:
+        recording = st.session_state.get("live_record")
+        if recording:
+            # Other sessions may have polled since; fetch every event so the record stands alone
+            live_feed.poller.request_resync()
+        update = live_feed.refresh()
+        if update is not None and recording:
+            get_recorder().record(update.live_data, update.fetched_at)
+        if update is None:
             st.session_state["live_message"] = ("warning", "❌ Live client data not available or game not running.")
             st.session_state["live_loaded"] = False
         else:
-            st.session_state["raw_live_data"] = live_data
+            # A reference to the shared update, not a copy of the payload
+            st.session_state["live_update"] = update
             st.session_state["live_loaded"] = True
             st.session_state["live_message"] = ("success", "✅ Live client data has been loaded and applied.")
         st.rerun()
@@ -335,13 +206,47 @@ with col_load:
 with col_clear:
     if st.button("❎ Clear Live Data"):
         st.session_state["live_loaded"] = False
-        st.session_state["raw_live_data"] = None
+        st.session_state["live_update"] = None
         st.session_state["live_message"] = ("info", "🧹 Live client data has been cleared.")
         st.rerun()
 
+# Auto-refresh: the shared poller scores every fresh live state
+col_auto, col_interval = st.columns([1, 1])
+with col_auto:
+    auto_refresh = st.toggle("📡 Auto-refresh live prediction", key="live_auto_refresh")
+    record_live = st.toggle("⏺ Record live games", key="live_record")
+with col_interval:
+    poll_interval = st.number_input("Poll interval (seconds)", 1.0, 60.0, value=2.0, step=0.5, key="live_poll_interval")
+
+def sync_subscription(key, wanted, callback=None, on_open=None):
+    """Open or close this session's feed subscription stored under ``key``."""
+    subscription = st.session_state.get(key)
+    if subscription is not None and subscription.closed:
+        subscription = None
+    if wanted and subscription is None:
+        if on_open is not None:
+            on_open()
+        subscription = live_feed.subscribe(callback, idle_timeout=SUBSCRIPTION_IDLE_TIMEOUT)
+    elif not wanted and subscription is not None:
+        subscription.close()
+        subscription = None
+    st.session_state[key] = subscription
+    if subscription is not None:
+        subscription.touch()
+    return subscription
+
+
+live_subscription = sync_subscription("live_subscription", auto_refresh)
+# The shared poller may be mid-game already: start the recording with the full event list
+sync_subscription("record_subscription", auto_refresh and record_live, get_recorder().record_update,
+                  on_open=get_recorder().mark_gap)
+if live_subscription is not None:
+    live_feed.poller.interval = poll_interval
+
 # Prefill inputs if live data is loaded
-if st.session_state.get("live_loaded", False):
-    fill_inputs_from_live_data(st.session_state.get("raw_live_data"))
+if st.session_state.get("live_loaded", False) and st.session_state.get("live_update") is not None:
+    with timed("state_write"):
+        st.session_state.update(st.session_state["live_update"].game.widget_state())
 
 # Display message with appropriate style
 if "live_message" in st.session_state:
@@ -361,158 +266,28 @@ if "live_message" in st.session_state:
 
 # === UI Layout and Inputs ===
 
-from base64 import b64encode
-
-with open("League Of Legends Wallpaper.jpg", "rb") as f:
-    data = b64encode(f.read()).decode()
-
-st.markdown(f"""
-<style>
-/* Transparent background for the main app container */
-.stApp {{
-    background-color: transparent !important;
-}}
-
-/* Add wallpaper as a fixed layer behind everything */
-.stApp::before {{
-    content: "";
-    position: fixed;
-    top: 0; left: 0; right: 0; bottom: 0;
-    background-image: url("data:image/jpeg;base64,{data}");
-    background-size: cover;
-    background-position: center;
-    background-repeat: no-repeat;
-    z-index: -1;
-    pointer-events: none;
-}}
-
-/* Add filter on a pseudo-element above the wallpaper */
-.stApp::after {{
-    content: "";
-    position: fixed;
-    top: 0; left: 0; right: 0; bottom: 0;
-    background-color: rgba(0, 0, 0, 0.4); /* darken */
-    backdrop-filter: brightness(40%) contrast(100%);
-    z-index: -1;
-    pointer-events: none;
-}}
-</style>
-""", unsafe_allow_html=True)
+with timed("wallpaper"):
+    st.markdown(wallpaper_css(), unsafe_allow_html=True)
 
 
 
 
+# Each input section is a fragment: editing one of its widgets reruns only
+# that section instead of the whole page.
 with st.expander("Game Data", expanded=False):  # expanded=True means it's open by default, omit or set False to start collapsed
-    
-    kills, deaths, assists, cs, champions, levels = [], [], [], [], [], []
 
     col1, col2 = st.columns(2)
 
     with col1:
         with st.container():
-            st.markdown("## 👤 Players")
-
-            for role in roles:
-                st.markdown(f'<div class="role-header">{role}</div>', unsafe_allow_html=True)
-                cols_kda = st.columns(3)
-                with cols_kda[0]:
-                    k_val = st.number_input("Kills", 0, 100, step=1, key=f"k_t1_{role}")
-                with cols_kda[1]:
-                    d_val = st.number_input("Deaths", 0, 100, step=1, key=f"d_t1_{role}")
-                with cols_kda[2]:
-                    a_val = st.number_input("Assists", 0, 100, step=1, key=f"a_t1_{role}")
-
-                cs_val = st.number_input("CS (Minions Killed)", 0, 2000, step=1, key=f"cs_t1_{role}")
-                champ_val = st.selectbox("Champion", champion_list, key=f"champ_t1_{role}")
-                level_val = st.number_input("Level", 1, 18, step=1, key=f"level_t1_{role}")
-
-                kills.append(k_val)
-                deaths.append(d_val)
-                assists.append(a_val)
-                cs.append(cs_val)
-                champions.append(champ_val)
-                levels.append(level_val)
-
-            st.markdown("</div>", unsafe_allow_html=True)
+            team_players_section("t1", "## 👤 Players")
 
     with col2:
         with st.container():
-            st.markdown("## ")
-
-            for role in roles:
-                st.markdown(f'<div class="role-header">{role}</div>', unsafe_allow_html=True)
-                cols_kda = st.columns(3)
-                with cols_kda[0]:
-                    k_val = st.number_input("Kills", 0, 100, step=1, key=f"k_t2_{role}")
-                with cols_kda[1]:
-                    d_val = st.number_input("Deaths", 0, 100, step=1, key=f"d_t2_{role}")
-                with cols_kda[2]:
-                    a_val = st.number_input("Assists", 0, 100, step=1, key=f"a_t2_{role}")
-
-                cs_val = st.number_input("CS (Minions Killed)", 0, 2000, step=1, key=f"cs_t2_{role}")
-                champ_val = st.selectbox("Champion", champion_list, key=f"champ_t2_{role}")
-                level_val = st.number_input("Level", 1, 18, step=1, key=f"level_t2_{role}")
-
-                kills.append(k_val)
-                deaths.append(d_val)
-                assists.append(a_val)
-                cs.append(cs_val)
-                champions.append(champ_val)
-                levels.append(level_val)
-
-            st.markdown("</div>", unsafe_allow_html=True)
-
-    # Objectives input
-    st.markdown("## 🏹 Objectives")
-    col_obj1, col_obj2 = st.columns(2)
-
-    with col_obj1:
-        st.markdown('<div class="objectives-col">', unsafe_allow_html=True)
-        dragons_100 = dragon_selectboxes("100")
-        barons_100 = st.slider("Barons (Team 100)", 0, 2, 0, step=1, key="b100")
-        towers_100 = st.slider("Towers (Team 100)", 0, 11, 0, step=1, key="t100")
-        herald_100 = st.radio("Rift Herald Taken (Team 100)", ["No", "Yes"], key="herald_100", horizontal=True)
-        first_blood_100 = st.radio("First Blood Taken (Team 100)", ["No", "Yes"], key="fb100", horizontal=True)
-        first_turret_100 = st.radio("First Turret Taken (Team 100)", ["No", "Yes"], key="first_turret_100", horizontal=True)
-        voidgrubs_100 = st.slider("Void Grubs Killed (Team 100)", 0, 3, 0, step=1, key="voidgrubs_100")
-        first_three_epic_camps_100 = st.radio("First Three Epic Camps Taken (Team 100)", ["No", "Yes"], key="first_three_epic_camps_100", horizontal=True)
-        first_three_kills_100 = st.radio("First Three Kills Taken (Team 100)", ["No", "Yes"], key="first_three_kills_100", horizontal=True)
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    with col_obj2:
-        st.markdown('<div class="objectives-col">', unsafe_allow_html=True)
-        dragons_200 = dragon_selectboxes("200")
-        barons_200 = st.slider("Barons (Team 200)", 0, 2, 0, step=1, key="b200")
-        towers_200 = st.slider("Towers (Team 200)", 0, 11, 0, step=1, key="t200")
-        herald_200 = st.radio("Rift Herald Taken (Team 200)", ["No", "Yes"], key="herald_200", horizontal=True)
-        first_blood_200 = st.radio("First Blood Taken (Team 200)", ["No", "Yes"], key="fb200", horizontal=True)
-        first_turret_200 = st.radio("First Turret Taken (Team 200)", ["No", "Yes"], key="first_turret_200", horizontal=True)
-        voidgrubs_200 = st.slider("Void Grubs Killed (Team 200)", 0, 3, 0, step=1, key="voidgrubs_200")
-        first_three_epic_camps_200 = st.radio("First Three Epic Camps Taken (Team 200)", ["No", "Yes"], key="first_three_epic_camps_200", horizontal=True)
-        first_three_kills_200 = st.radio("First Three Kills Taken (Team 200)", ["No", "Yes"], key="first_three_kills_200", horizontal=True)
-
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    # Rift Herald and First Blood exclusivity warnings
-    if herald_100 == "Yes" and herald_200 == "Yes":
-        st.warning("⚠️ Rift Herald can only be taken by one team!")
-    if first_blood_100 == "Yes" and first_blood_200 == "Yes":
-        st.warning("⚠️ First Blood can only be taken by one team!")
-
-    # Metadata inputs
-    st.markdown("## 🗂 Metadata")
-
-    col_min, col_sec = st.columns([1, 1])
-    with col_min:
-        snapshot_min = st.number_input("Minutes", 0, 120, value=22, step=1, key="snapshot_time_min")
-    with col_sec:
-        snapshot_sec = st.number_input("Seconds", 0, 59, value=0, step=1, key="snapshot_time_sec_partial")
-
-    # Calculate total seconds
-    snapshot_time_sec = snapshot_min * 60 + snapshot_sec
+            team_players_section("t2", "## ")
 
-    if snapshot_time_sec == 0:
-        st.warning("⏱️ Please enter a snapshot time greater than 0 before predicting.")
+    objectives_section()
+    metadata_section()
 
 
 
@@ -534,60 +309,188 @@ platform_id = platform_values[platform_display.index(platform_display_selected)]
 
 
 
-# Prediction logic
-if st.button("⚔️ Predict Match Outcome"):
-    if snapshot_time_sec == 0:
-        st.error("❌ Please enter a valid snapshot time (greater than 0) before predicting.")
+# Per-game prediction history, bounded in size for the whole session
+timelines = st.session_state.setdefault("timelines", TimelineStore())
+
+# Live prediction, refreshed on its own without rerunning the whole page
+if live_subscription is not None:
+
+    @st.fragment(run_every=poll_interval)
+    def live_prediction_panel():
+        st.markdown("## 📡 Live prediction")
+        for key in ("live_subscription", "record_subscription"):
+            if st.session_state.get(key) is not None:
+                st.session_state[key].touch()
+        update = live_feed.latest
+        poller = live_feed.poller
+        if poller.failures:
+            st.warning(f"❌ Live client not reachable, retrying in {poller.next_delay:.0f}s.")
+        if update is None:
+            st.info("⏳ Waiting for live client data...")
+            return
+
+        # The shared update is scored for the feed's platform/rank; rescore for this session if needed
+        game, winner, proba = update.game, update.winner, update.proba
+        if (game.platform_id, game.rank) != (platform_id, rank):
+            game = game.copy()
+            game.platform_id, game.rank = platform_id, rank
+            winners, probas = predictor.predict_games([game])
+            winner, proba = winners[0], probas[0]
+
+        game_time = game.game_time
+        winner = "🟦 Team 1" if winner == 100 else "🟥 Team 2"
+        st.caption(
+            f"Game time {int(game_time // 60)}:{int(game_time % 60):02d} · update #{update.version}"
+            f" · {live_feed.subscriber_count} subscriber(s)"
+        )
+        col_t1, col_t2 = st.columns(2)
+        col_t1.metric("🟦 Team 1 win probability", f"{proba[0]:.0%}")
+        col_t2.metric("🟥 Team 2 win probability", f"{proba[1]:.0%}")
+        st.success(f"🏁 {winner} favoured")
+
+        if st.session_state.get("live_recorded_version") != update.version:
+            timelines.record(game, proba)
+            st.session_state["live_recorded_version"] = update.version
+        render_timeline(timelines.current)
+
+    live_prediction_panel()
+
+
+# Prediction, rerun on its own; the model only runs when the inputs changed
+@st.fragment
+def prediction_section(platform_id, rank, show_timeline):
+    if st.button("⚔️ Predict Match Outcome"):
+        game = GameState.from_widget_state(st.session_state, platform_id, rank)
+        if game.game_time == 0:
+            st.error("❌ Please enter a valid snapshot time (greater than 0) before predicting.")
+        else:
+            last = st.session_state.get("last_prediction")
+            if last is None or last["game"] != game:
+                X, unmapped = predictor.encode_games([game])
+                winners, probas = predictor.predict_matrix(X)
+                last = {"game": game, "X": X.copy(), "unmapped": unmapped,
+                        "winner": winners[0], "proba": probas[0]}
+                st.session_state["last_prediction"] = last
+                timelines.record(game, last["proba"])
+
+            if last["unmapped"]:
+                st.warning(f"⚠️ Inputs with no matching model column were ignored: {', '.join(last['unmapped'])}")
+            st.write("📊 Model Input Data", pd.DataFrame(last["X"], columns=predictor.feature_columns))
+
+            proba = last["proba"]
+            winner = "🟦 Team 1 Wins" if last["winner"] == 100 else "🟥 Team 2 Wins"
+            st.success(f"🏁 {winner}")
+            st.info(f"Confidence → Team 1: {proba[0]:.2f}, Team 2: {proba[1]:.2f}")
+
+    if show_timeline:
+        render_timeline(timelines.current)
+
+# Counterfactual scenarios, all scored in one batch with the current state
+@st.fragment
+def what_if_section(platform_id, rank):
+    with st.expander("🔮 What-if scenarios", expanded=False):
+        if st.button("Evaluate what-if scenarios"):
+            snapshot = GameState.from_widget_state(st.session_state, platform_id, rank).to_snapshot()
+            base, results = evaluate_scenarios(predictor, snapshot)
+            st.info(f"Current → Team 1: {base[0]:.2f}, Team 2: {base[1]:.2f}")
+            st.dataframe(
+                pd.DataFrame({
+                    "Scenario": [r["label"] for r in results],
+                    "Team 1 win probability": [r["proba"][0] for r in results],
+                    "Change for Team 1": [r["change"][0] for r in results],
+                }).sort_values("Change for Team 1", ascending=False),
+                hide_index=True,
+                column_config={
+                    "Team 1 win probability": st.column_config.NumberColumn(format="%.2f"),
+                    "Change for Team 1": st.column_config.NumberColumn(format="%+.3f"),
+                },
+            )
+
+            try:
+                intercept, contributions = feature_contributions(predictor, snapshot)
+            except ValueError as e:
+                st.info(str(e))
+            else:
+                st.markdown("**Logit contributions** (coefficient × value; positive favours Team 2)")
+                st.caption(f"Intercept {intercept:+.3f}")
+                st.dataframe(
+                    pd.DataFrame(contributions, columns=["Feature", "Value", "Coefficient", "Contribution"]),
+                    hide_index=True,
+                )
+
+prediction_section(platform_id, rank, show_timeline=live_subscription is None)
+what_if_section(platform_id, rank)
+
+# Dashboard of every watched game; the endpoint list is shared by all sessions
+with st.expander("🖥 Multi-game monitor", expanded=False):
+    endpoints_text = st.text_area(
+        "LiveClientData endpoints (one per line, optionally name=url)",
+        placeholder="https://127.0.0.1:2999\nscrim=https://10.0.0.7:2999",
+        key="monitor_endpoints",
+    )
+    endpoints = [line.strip() for line in endpoints_text.splitlines() if line.strip()]
+    # The monitor thread only starts once someone enters an endpoint
+    if endpoints or st.session_state.get("monitor_applied_endpoints"):
+        live_monitor = get_live_monitor()
+        if endpoints != st.session_state.get("monitor_applied_endpoints"):
+            live_monitor.set_endpoints(endpoints)
+            st.session_state["monitor_applied_endpoints"] = endpoints
+
+        @st.fragment(run_every=2.0)
+        def monitor_dashboard():
+            rows = live_monitor.rows()
+            if not rows:
+                st.caption("No endpoints watched.")
+                return
+            table = pd.DataFrame(rows)
+            table["game_time"] = table["game_time"].map(
+                lambda t: None if pd.isna(t) else f"{int(t // 60)}:{int(t % 60):02d}"
+            )
+            table["favoured"] = table["favoured"].map({100: "🟦 Team 1", 200: "🟥 Team 2"})
+            st.dataframe(
+                table[["game", "status", "game_time", "proba_100", "proba_200", "favoured",
+                       "updated_s_ago", "retry_in_s", "error"]],
+                column_config={
+                    "proba_100": st.column_config.ProgressColumn("🟦 Team 1", format="percent", min_value=0, max_value=1),
+                    "proba_200": st.column_config.ProgressColumn("🟥 Team 2", format="percent", min_value=0, max_value=1),
+                    "updated_s_ago": st.column_config.NumberColumn("Updated (s ago)", format="%.1f"),
+                    "retry_in_s": st.column_config.NumberColumn("Retry in (s)", format="%.0f"),
+                },
+                hide_index=True,
+            )
+
+        monitor_dashboard()
+
+# Rolling per-stage latencies for this process (all sessions)
+with st.expander("🛠 Debug: stage latencies", expanded=False):
+    latency_summary = stage_timings.summary()
+    if latency_summary:
+        st.dataframe(
+            pd.DataFrame.from_dict(latency_summary, orient="index")[
+                ["count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+            ],
+            column_config={
+                c: st.column_config.NumberColumn(format="%.2f")
+                for c in ["mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+            },
+        )
     else:
-
-        df = {}
-        for i in range(10):
-            team_id = "t1" if i < 5 else "t2"
-            role = roles[i % 5]
-
-            df[f"kills_p{i+1}"] = [st.session_state[f"k_{team_id}_{role}"]]
-            df[f"deaths_p{i+1}"] = [st.session_state[f"d_{team_id}_{role}"]]
-            df[f"assists_p{i+1}"] = [st.session_state[f"a_{team_id}_{role}"]]
-            df[f"total_minions_killed_p{i+1}"] = [st.session_state[f"cs_{team_id}_{role}"]]
-            df[f"level_p{i+1}"] = [st.session_state[f"level_{team_id}_{role}"]]  # <-- added level here
-
-        df.update({
-            "dragons_100": sum(1 for d in [st.session_state[f"drag100_{i}"] for i in range(5)] if d != "None"),
-            "dragons_200": sum(1 for d in [st.session_state[f"drag200_{i}"] for i in range(5)] if d != "None"),
-            "heralds_100": 1 if st.session_state["herald_100"] == "Yes" else 0,
-            "heralds_200": 1 if st.session_state["herald_200"] == "Yes" else 0,
-            "voidgrubs_100": st.session_state.get("voidgrubs_100", 0),
-            "voidgrubs_200": st.session_state.get("voidgrubs_200", 0),
-            "barons_100": st.session_state["b100"],
-            "barons_200": st.session_state["b200"],
-            "towers_100": st.session_state["t100"],
-            "towers_200": st.session_state["t200"],
-            "first_blood_100": 1 if st.session_state["fb100"] == "Yes" else 0,
-            "first_blood_200": 1 if st.session_state["fb200"] == "Yes" else 0,
-            "first_turret_100": 1 if st.session_state.get("first_turret_100", "No") == "Yes" else 0,
-            "first_turret_200": 1 if st.session_state.get("first_turret_200", "No") == "Yes" else 0,
-            "first_three_epic_camps_100": 1 if st.session_state.get("first_three_epic_camps_100", "No") == "Yes" else 0,
-            "first_three_epic_camps_200": 1 if st.session_state.get("first_three_epic_camps_200", "No") == "Yes" else 0,
-            "first_three_kills_100": 1 if st.session_state.get("first_three_kills_100", "No") == "Yes" else 0,
-            "first_three_kills_200": 1 if st.session_state.get("first_three_kills_200", "No") == "Yes" else 0,
-            "snapshot_time_sec": snapshot_time_sec,
-            "platform_id": platform_id,
-            "rank": rank,
-        })
-
-        df.update(get_class_subclass_features(champions))
-        df = pd.DataFrame(df)
-
-        feature_columns = joblib.load("feature_columns.pkl")
-
-        df = pd.get_dummies(df, columns=["platform_id", "rank"])
-        df = df.reindex(columns=feature_columns, fill_value=0)
-
-        st.write("📊 Model Input Data", df)
-
-        pred = model.predict(df)[0]
-        proba = model.predict_proba(df)[0]
-
-        winner = "🟦 Team 1 Wins" if pred == 100 else "🟥 Team 2 Wins"
-        st.success(f"🏁 {winner}")
-        st.info(f"Confidence → Team 1: {proba[0]:.2f}, Team 2: {proba[1]:.2f}")
+        st.caption("No timings recorded yet.")
+    if predictor.cache is not None:
+        cache_stats = predictor.cache.stats()
+        st.caption(
+            f"Prediction cache: {cache_stats['size']}/{cache_stats['max_entries']} entries · "
+            f"{cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%}) · {cache_stats['evictions']} evictions"
+        )
+    if predictor.static_terms is not None:
+        static_stats = predictor.static_terms.stats()
+        st.caption(
+            f"Static logit terms: {static_stats['size']}/{static_stats['max_entries']} games · "
+            f"{static_stats['hits']} hits / {static_stats['misses']} misses"
+        )
+    col_json, col_prom = st.columns(2)
+    col_json.download_button("Export JSON", stage_timings.to_json(), "stage_latency.json", "application/json")
+    col_prom.download_button("Export Prometheus", stage_timings.to_prometheus(), "stage_latency.prom", "text/plain")
+
+stage_timings.observe("render", time.perf_counter() - render_started)
@@ -0,0 +1,161 @@
+"""Counterfactual "what-if" scenarios and per-feature logit contributions.
+
+A scenario is a label plus field deltas applied to a snapshot, e.g.
+``("Team 1 takes Baron", {"barons_100": 1})``. The current snapshot and
+every scenario are scored in one batch, so dozens of scenarios cost about
+as much as a single prediction.
+
+Dragon scenarios add a typed dragon, so the ``dragons_{team}`` total and
+the per-type dragon fields move together: the rift's elemental (the type
+taken most so far), or Elder once a team has its soul.
+"""
+import numpy as np
+
+from game_state import DRAGON_FIELD_PREFIXES, DRAGON_TYPES, TEAMS, GameState
+
+SOUL_DRAGONS = 4
+
+TEAM_NAMES = {100: "Team 1", 200: "Team 2"}
+N_PLAYERS = 10
+
+# Same limits as the UI widgets
+FIELD_LIMITS = {
+    "dragons": 5,
+    "barons": 2,
+    "towers": 11,
+    "heralds": 1,
+    "voidgrubs": 3,
+}
+
+
+def team_players(team):
+    return range(1, 6) if team == 100 else range(6, 11)
+
+
+def next_dragons(snapshot, team, n):
+    """The types of the next ``n`` dragons if ``team`` takes them all."""
+    counts = GameState.from_snapshot(snapshot).dragon_type_counts()
+    elder = DRAGON_TYPES.index("Elder")
+    t = TEAMS.index(team)
+    taken = []
+    for _ in range(n):
+        elementals = np.delete(counts, elder, axis=1)
+        if (elementals.sum(axis=1) >= SOUL_DRAGONS).any():
+            d = elder
+        else:
+            # argmax keeps DRAGON_TYPES order on ties, so Infernal with no dragons taken yet
+            d = int(np.argmax(elementals.sum(axis=0)))
+        counts[t, d] += 1
+        taken.append(DRAGON_TYPES[d])
+    return taken
+
+
+def dragon_deltas(team, dragons):
+    """Deltas adding typed dragons to the total and to their per-type fields."""
+    deltas = {f"dragons_{team}": len(dragons)}
+    for d in dragons:
+        field = f"{DRAGON_FIELD_PREFIXES[d]}_dragon_{team}"
+        deltas[field] = deltas.get(field, 0) + 1
+    return deltas
+
+
+def default_scenarios(snapshot):
+    """Objective and fight outcomes for each team."""
+    scenarios = []
+    for team in (100, 200):
+        name = TEAM_NAMES[team]
+        other = 300 - team
+        one, two = next_dragons(snapshot, team, 1), next_dragons(snapshot, team, 2)
+        scenarios += [
+            (f"{name} takes Baron", {f"barons_{team}": 1}),
+            (f"{name} takes a dragon ({one[0]})", dragon_deltas(team, one)),
+            (f"{name} takes two dragons ({', '.join(two)})", dragon_deltas(team, two)),
+            (f"{name} takes a tower", {f"towers_{team}": 1}),
+            (f"{name} takes two towers", {f"towers_{team}": 2}),
+            (f"{name} takes Rift Herald", {f"heralds_{team}": 1}),
+            (f"{name} takes a void grub", {f"voidgrubs_{team}": 1}),
+        ]
+        # A won 2-for-0 skirmish: two kills for the team, deaths spread on the enemy side
+        fight = {}
+        for i, p in enumerate(list(team_players(team))[:2]):
+            fight[f"kills_p{p}"] = 1
+            fight[f"deaths_p{list(team_players(other))[i]}"] = 1
+        scenarios.append((f"{name} wins a 2-for-0 fight", fight))
+        scenarios.append((
+            f"{name} ace + Baron",
+            {**{f"kills_p{p}": 1 for p in team_players(team)},
+             **{f"deaths_p{p}": 1 for p in team_players(other)},
+             f"barons_{team}": 1},
+        ))
+    return scenarios
+
+
+def apply_deltas(snapshot, deltas):
+    """Copy of ``snapshot`` with deltas added; None if a limit would be exceeded."""
+    changed = dict(snapshot)
+    for field, delta in deltas.items():
+        value = changed.get(field, 0) + delta
+        limit = FIELD_LIMITS.get(field.rsplit("_", 1)[0])
+        if value < 0 or (limit is not None and value > limit):
+            return None
+        changed[field] = value
+    return changed
+
+
+def build_scenarios(snapshot, scenarios=None):
+    """Return (batch, feasible scenarios); the batch starts with the snapshot itself."""
+    if scenarios is None:
+        scenarios = default_scenarios(snapshot)
+    feasible = []
+    batch = [snapshot]
+    for label, deltas in scenarios:
+        changed = apply_deltas(snapshot, deltas)
+        if changed is not None:
+            feasible.append((label, deltas))
+            batch.append(changed)
+    return batch, feasible
+
+
+def scenario_results(feasible, proba):
+    """Pair scored batch rows with their scenarios; returns (base, results)."""
+    base = proba[0]
+    results = [
+        {"label": label, "deltas": deltas, "proba": row, "change": row - base}
+        for (label, deltas), row in zip(feasible, proba[1:])
+    ]
+    return base, results
+
+
+def evaluate_scenarios(predictor, snapshot, scenarios=None):
+    """Score the snapshot and all feasible scenarios in one batch.
+
+    Returns (base probabilities, list of scenario dicts with ``label``,
+    ``deltas``, ``proba`` and ``change``). Probabilities follow
+    ``model.classes_`` order (team 100, team 200).
+    """
+    batch, feasible = build_scenarios(snapshot, scenarios)
+    _, proba = predictor.predict(batch)
+    return scenario_results(feasible, proba)
+
+
+def feature_contributions(predictor, snapshot):
+    """Per-feature logit terms (coefficient x value) of one prediction.
+
+    Positive contributions push towards ``model.classes_[1]`` (team 200).
+    Returns (intercept, list of (feature, value, coefficient, contribution)
+    for non-zero features, sorted by absolute contribution). Coefficients
+    are on the raw features, with any scaling folded in; raises ValueError
+    if the predictor's model is not linear.
+    """
+    linear_model = predictor.linear_model
+    if linear_model is None:
+        raise ValueError(f"Feature contributions need a linear model, not {type(predictor.model).__name__}")
+    X, _ = predictor.encode([snapshot])
+    x = X[0]
+    coef = linear_model.coef
+    terms = coef * x
+    nonzero = np.nonzero(x)[0]
+    order = nonzero[np.argsort(-np.abs(terms[nonzero]), kind="stable")]
+    columns = predictor.feature_columns
+    rows = [(columns[i], float(x[i]), float(coef[i]), float(terms[i])) for i in order]
+    return float(linear_model.intercept), rows